@@ -7,7 +7,6 @@ Sets up basic system configuration before main.py runs.
 """
 
 import gc
-import time
 from machine import freq
 
 # Increase CPU frequency for better performance
@@ -19,9 +18,10 @@ gc.enable()
 # Initial garbage collection
 gc.collect()
 
+# Collect once a quarter of the free heap has been allocated instead of
+# waiting for an allocation to fail on a fragmented heap
+gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+
 print("CYD Planter Sensor - System initialized")
 print(f"Free memory: {gc.mem_free()} bytes")
 print(f"CPU frequency: {freq()} Hz")
-
-# Small delay before main application
-time.sleep_ms(100)
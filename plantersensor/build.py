@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+CYD Stopwatch - Bytecode Builder
+================================
+
+Precompiles the application to MicroPython .mpy bytecode with mpy-cross so
+the ESP32 loads ready-made bytecode instead of tokenizing, parsing and
+compiling every module from source on each boot.
+
+The application code in main.py is compiled to stopwatch_app.mpy and a tiny
+main.py stub that imports it is generated, because MicroPython only runs
+boot.py/main.py from source. The .mpy version must match the firmware, so
+use the mpy-cross release that matches the MicroPython version on the device.
+
+Usage:
+    python build.py
+    python build.py --port /dev/cu.usbserial-1420
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+
+class Colors:
+    """ANSI color codes for terminal output"""
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    PURPLE = '\033[0;35m'
+    CYAN = '\033[0;36m'
+    NC = '\033[0m'  # No Color
+
+
+# Modules compiled to .mpy (source path, path on the device)
+COMPILED_MODULES = [
+    ("stopwatch.py", "stopwatch.mpy"),
+    ("display_manager.py", "display_manager.mpy"),
+    ("touch_handler.py", "touch_handler.mpy"),
+    ("config.py", "config.mpy"),
+    ("web_monitor.py", "web_monitor.mpy"),  # imported when WEB_MONITOR_ENABLED
+    ("main.py", "stopwatch_app.mpy"),
+    ("lib/ili9341.py", "lib/ili9341.mpy"),
+    ("lib/xglcd_font.py", "lib/xglcd_font.mpy"),
+    ("lib/xpt2046.py", "lib/xpt2046.mpy"),
+]
+
+# Files shipped as plain source (MicroPython only executes these from .py)
+SOURCE_FILES = ["boot.py"]
+
+MAIN_STUB = '''"""Entry point stub - the application is precompiled in stopwatch_app.mpy"""
+import stopwatch_app
+'''
+
+# -O3 strips asserts and line numbers, xtensawin enables @native/@viper code
+MPY_CROSS_FLAGS = ["-O3", "-march=xtensawin"]
+
+
+def print_header(text: str) -> None:
+    """Print a formatted header"""
+    print(f"\n{Colors.PURPLE}{'=' * 60}{Colors.NC}")
+    print(f"{Colors.PURPLE} {text}{Colors.NC}")
+    print(f"{Colors.PURPLE}{'=' * 60}{Colors.NC}\n")
+
+
+def print_step(text: str) -> None:
+    """Print a step message"""
+    print(f"{Colors.CYAN}➤ {text}{Colors.NC}")
+
+
+def print_success(text: str) -> None:
+    """Print a success message"""
+    print(f"{Colors.GREEN}✓ {text}{Colors.NC}")
+
+
+def print_error(text: str) -> None:
+    """Print an error message"""
+    print(f"{Colors.RED}✗ {text}{Colors.NC}")
+
+
+def find_mpy_cross() -> List[str]:
+    """Locate mpy-cross, either on PATH or as the mpy_cross Python package"""
+    if shutil.which("mpy-cross"):
+        return ["mpy-cross"]
+    try:
+        import mpy_cross  # noqa: F401
+        return [sys.executable, "-m", "mpy_cross"]
+    except ImportError:
+        return []
+
+
+def build(build_dir: Path) -> bool:
+    """Compile the application into build_dir"""
+    print_step("Compiling modules with mpy-cross...")
+
+    mpy_cross = find_mpy_cross()
+    if not mpy_cross:
+        print_error("mpy-cross not found. Please install it with: pip install mpy-cross")
+        return False
+
+    if build_dir.exists():
+        shutil.rmtree(build_dir)
+    (build_dir / "lib").mkdir(parents=True)
+
+    for src, dst in COMPILED_MODULES:
+        if not Path(src).exists():
+            print_error(f"Missing {src}")
+            return False
+
+        cmd = mpy_cross + MPY_CROSS_FLAGS + ["-o", str(build_dir / dst), src]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print_error(f"Failed to compile {src}: {result.stderr.strip()}")
+            return False
+        print_success(f"Compiled {src} -> {dst}")
+
+    for src in SOURCE_FILES:
+        shutil.copy2(src, build_dir / src)
+        print_success(f"Copied {src}")
+
+    (build_dir / "main.py").write_text(MAIN_STUB)
+    print_success("Generated main.py stub")
+
+    return True
+
+
+def upload(port: str, build_dir: Path) -> bool:
+    """Upload the build to the device in a single mpremote session"""
+    print_step(f"Uploading build to {port}...")
+
+    # Stale .py sources take precedence over .mpy on import, remove them first
+    stale = [src for src, _ in COMPILED_MODULES if src != "main.py"]
+    cleanup = (
+        "import os\n"
+        f"for f in {stale!r}:\n"
+        "    try:\n"
+        "        os.remove(f)\n"
+        "    except OSError:\n"
+        "        pass\n"
+    )
+
+    items = sorted(str(p) for p in build_dir.iterdir())
+    cmd = ["mpremote", "connect", port,
+           "exec", cleanup, "+",
+           "fs", "cp", "-r"] + items + [":"]
+
+    try:
+        result = subprocess.run(cmd)
+    except FileNotFoundError:
+        print_error("mpremote not found. Please install it with: pip install mpremote")
+        return False
+
+    if result.returncode != 0:
+        print_error("Upload failed")
+        return False
+
+    print_success("Build uploaded")
+    return True
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Precompile the CYD Stopwatch to .mpy bytecode")
+    parser.add_argument('--port', '-p', help='Upload the build to this serial port')
+    parser.add_argument('--build-dir', '-o', default='build', help='Output directory (default: build)')
+
+    args = parser.parse_args()
+
+    print_header("CYD STOPWATCH - BYTECODE BUILD")
+
+    if not Path("main.py").exists():
+        print_error("Run this script from the plantersensor directory")
+        sys.exit(1)
+
+    build_dir = Path(args.build_dir)
+    if not build(build_dir):
+        sys.exit(1)
+
+    if args.port:
+        if not upload(args.port, build_dir):
+            sys.exit(1)
+        print_success("Reset your CYD to start the precompiled application")
+    else:
+        print(f"\n{Colors.BLUE}Build ready in '{build_dir}'. Upload with --port PORT{Colors.NC}")
+
+
+if __name__ == '__main__':
+    main()
@@ -19,10 +19,11 @@ from test_stopwatch import MockMachine, MockTime
 # Setup mocks
 sys.modules['machine'] = MockMachine()
 original_time = sys.modules['time']
-mock_time = MockTime()
-original_time.ticks_ms = mock_time.ticks_ms
-original_time.ticks_diff = mock_time.ticks_diff
-original_time.sleep_ms = mock_time.sleep_ms
+# MockTime only has static methods, bind them straight off the class
+original_time.ticks_ms = MockTime.ticks_ms
+original_time.ticks_us = MockTime.ticks_us
+original_time.ticks_diff = MockTime.ticks_diff
+original_time.sleep_ms = MockTime.sleep_ms
 
 # Now import our stopwatch
 from stopwatch import Stopwatch
@@ -113,7 +114,7 @@ def demo_long_timing():
     ]
 
     for ms, description in test_times:
-        sw.total_elapsed = ms
+        sw.set_elapsed_time(ms)
         formatted = sw.get_formatted_time()
         minimal = sw.get_formatted_time('minimal')
         print(f"  {description:25} → {formatted} ({minimal})")
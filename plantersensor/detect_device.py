@@ -9,27 +9,93 @@ This script helps detect and troubleshoot ESP32 CYD connection issues.
 import subprocess
 import sys
 import time
-import glob
 import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# Query esptool in-process instead of spawning it when it is importable
+try:
+    import esptool
+except ImportError:
+    esptool = None
+
+# pyserial reports the USB VID/PID of each serial port
+try:
+    from serial.tools import list_ports
+except ImportError:
+    list_ports = None
+
+# USB vendor IDs of the USB-to-serial bridges found on ESP32 boards
+USB_SERIAL_VIDS = {
+    0x10C4: "Silicon Labs CP210x",
+    0x1A86: "WCH CH340/CH341",
+    0x0403: "FTDI",
+    0x303A: "Espressif",
+}
+
+# Keywords of ESP32 serial device names and system USB descriptions
+ESP_CHIP_RE = re.compile(r"usbserial|slab|cp210|ch340|ch341|ftdi|esp", re.IGNORECASE)
+USB_KEYWORD_RE = re.compile(r"esp|serial|ch340|cp210|ftdi|uart|silicon labs", re.IGNORECASE)
+
+# Common USB-to-Serial driver locations on macOS
+DRIVER_PATHS = (
+    "/System/Library/Extensions/SiLabsUSBDriver.kext",
+    "/Library/Extensions/SiLabsUSBDriver.kext",
+    "/System/Library/Extensions/FTDIUSBSerialDriver.kext",
+    "/Library/Extensions/FTDIUSBSerialDriver.kext"
+)
+
+# esptool entry points to try, in order
+ESPTOOL_COMMANDS = (('esptool.py',), ('esptool',), (sys.executable, '-m', 'esptool'))
+
+# IOKit functions loaded through pyobjc (name, Objective-C signature)
+IOKIT_FUNCTIONS = [
+    ("IOServiceMatching", b"@*"),
+    ("IOServiceGetMatchingServices", b"iI@o^I"),
+    ("IOIteratorNext", b"II"),
+    ("IORegistryEntryCreateCFProperties", b"IIo^@@I"),
+    ("IOObjectRelease", b"II"),
+]
+
+@lru_cache(maxsize=None)
 def run_command(cmd, capture_output=True):
-    """Run a command and return the result."""
+    """Run a command and return the result (cached, probes are static per run).
+
+    cmd is an argument tuple, run directly without an intermediate shell.
+    """
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=capture_output, text=True)
+        result = subprocess.run(cmd, capture_output=capture_output, text=True)
         return result.returncode == 0, result.stdout, result.stderr
     except Exception as e:
         return False, "", str(e)
 
+@lru_cache(maxsize=None)
+def probe_usb_devices():
+    """Return (esp_devices, serial_devices) for the serial ports on this host."""
+    # Identify USB-to-serial bridges by vendor ID when pyserial is available
+    if list_ports is not None:
+        ports = sorted(list_ports.comports(), key=lambda port: port.device)
+        esp_devices = [port.device for port in ports if port.vid in USB_SERIAL_VIDS]
+        return esp_devices, [port.device for port in ports]
+
+    # Otherwise check for serial devices in a single pass over /dev
+    try:
+        with os.scandir("/dev") as entries:
+            serial_devices = sorted(f"/dev/{entry.name}" for entry in entries
+                                    if entry.name.startswith(("cu.", "tty.")))
+    except FileNotFoundError:
+        serial_devices = []
+    esp_devices = [dev for dev in serial_devices if ESP_CHIP_RE.search(dev)]
+    return esp_devices, serial_devices
+
 def check_usb_devices():
     """Check for USB devices that might be the ESP32."""
     print("🔍 Checking USB devices...")
 
-    # Check for serial devices
-    serial_devices = glob.glob("/dev/cu.*") + glob.glob("/dev/tty.*")
-    esp_devices = [dev for dev in serial_devices if any(chip in dev.lower() for chip in
-                   ['usbserial', 'slab', 'cp210', 'ch340', 'ch341', 'ftdi', 'esp'])]
-
+    esp_devices, serial_devices = probe_usb_devices()
     if esp_devices:
         print(f"✅ Found potential ESP32 devices: {esp_devices}")
         return esp_devices
@@ -38,43 +104,107 @@ def check_usb_devices():
         print(f"📋 All serial devices: {serial_devices}")
         return []
 
+def load_iokit():
+    """Load the IOKit registry functions via pyobjc, or None if unavailable."""
+    try:
+        import objc
+        from Foundation import NSBundle
+    except ImportError:
+        return None
+
+    bundle = NSBundle.bundleWithIdentifier_("com.apple.framework.IOKit")
+    if bundle is None:
+        return None
+
+    iokit = {}
+    objc.loadBundleFunctions(bundle, iokit, IOKIT_FUNCTIONS)
+    return iokit
+
+def list_iokit_usb_devices():
+    """List USB-to-serial bridges from the IOKit registry.
+
+    Returns a tuple of (vid, pid, vendor, product) tuples, or None when pyobjc
+    is not available.
+    """
+    iokit = load_iokit()
+    if iokit is None:
+        return None
+
+    devices = []
+    # IOUSBHostDevice on current macOS, IOUSBDevice on older releases
+    for class_name in (b"IOUSBHostDevice", b"IOUSBDevice"):
+        matching = iokit["IOServiceMatching"](class_name)
+        err, iterator = iokit["IOServiceGetMatchingServices"](0, matching, None)
+        if err:
+            continue
+
+        entry = iokit["IOIteratorNext"](iterator)
+        while entry:
+            err, props = iokit["IORegistryEntryCreateCFProperties"](entry, None, None, 0)
+            if not err and props:
+                vid = props.get("idVendor")
+                if vid in USB_SERIAL_VIDS:
+                    devices.append((
+                        vid,
+                        props.get("idProduct") or 0,
+                        props.get("USB Vendor Name") or USB_SERIAL_VIDS[vid],
+                        props.get("USB Product Name") or "",
+                    ))
+            iokit["IOObjectRelease"](entry)
+            entry = iokit["IOIteratorNext"](iterator)
+        iokit["IOObjectRelease"](iterator)
+
+        if devices:
+            break
+
+    return tuple(devices)
+
+@lru_cache(maxsize=None)
+def probe_system_usb():
+    """Probe the system for ESP32-like USB devices.
+
+    Returns (entries, error) where entries is a tuple of description lines,
+    or None if the probe failed.
+    """
+    # Query the IOKit registry in-process when pyobjc is installed
+    devices = list_iokit_usb_devices()
+    if devices is not None:
+        return tuple(f"{vendor} {product} (VID 0x{vid:04X}, PID 0x{pid:04X})"
+                     for vid, pid, vendor, product in devices), ""
+
+    # Fall back to system_profiler
+    success, output, error = run_command(("system_profiler", "SPUSBDataType"))
+    if not success:
+        return None, error
+
+    # Look for ESP32-related keywords
+    return tuple(line.strip() for line in output.splitlines()
+                 if USB_KEYWORD_RE.search(line)), ""
+
 def check_system_usb():
     """Check system USB information."""
     print("\n🔍 Checking system USB information...")
 
-    success, output, error = run_command("system_profiler SPUSBDataType")
-    if success:
-        # Look for ESP32-related keywords
-        lines = output.lower().split('\n')
-        esp_lines = [line for line in lines if any(keyword in line for keyword in
-                    ['esp', 'serial', 'ch340', 'cp210', 'ftdi', 'uart', 'silicon labs'])]
-
-        if esp_lines:
-            print("✅ Found USB devices that might be ESP32:")
-            for line in esp_lines:
-                print(f"   {line.strip()}")
-        else:
-            print("❌ No ESP32-related USB devices found in system")
-    else:
+    esp_lines, error = probe_system_usb()
+    if esp_lines is None:
         print(f"❌ Error checking USB devices: {error}")
+    elif esp_lines:
+        print("✅ Found USB devices that might be ESP32:")
+        for line in esp_lines:
+            print(f"   {line}")
+    else:
+        print("❌ No ESP32-related USB devices found in system")
+
+@lru_cache(maxsize=None)
+def probe_drivers():
+    """Return the common USB-to-Serial driver paths that are installed."""
+    return tuple(path for path in DRIVER_PATHS if os.path.exists(path))
 
 def check_drivers():
     """Check if necessary drivers are installed."""
     print("\n🔍 Checking for USB-to-Serial drivers...")
 
-    # Check for common driver files
-    driver_paths = [
-        "/System/Library/Extensions/SiLabsUSBDriver.kext",
-        "/Library/Extensions/SiLabsUSBDriver.kext",
-        "/System/Library/Extensions/FTDIUSBSerialDriver.kext",
-        "/Library/Extensions/FTDIUSBSerialDriver.kext"
-    ]
-
-    found_drivers = []
-    for path in driver_paths:
-        if os.path.exists(path):
-            found_drivers.append(path)
-
+    found_drivers = probe_drivers()
     if found_drivers:
         print("✅ Found USB-to-Serial drivers:")
         for driver in found_drivers:
@@ -82,30 +212,52 @@ def check_drivers():
     else:
         print("❌ No common USB-to-Serial drivers found")
 
+@lru_cache(maxsize=None)
+def probe_esptool():
+    """Find a working esptool.
+
+    Returns (command, version, ports) or None if esptool is not available.
+    ports is an empty string when esptool lists no ports.
+    """
+    if esptool is not None:
+        if list_ports is not None:
+            ports = " ".join(sorted(port.device for port in list_ports.comports()))
+        else:
+            ports = ""
+        return "esptool (Python module)", esptool.__version__, ports
+
+    # Try different esptool commands
+    for cmd in ESPTOOL_COMMANDS:
+        # Look the program up on PATH first instead of spawning a missing one
+        if shutil.which(cmd[0]) is None:
+            continue
+        success, output, error = run_command(cmd + ("version",))
+        if success:
+            version = output.strip()
+            success, output, error = run_command(cmd + ("--list-ports",))
+            return " ".join(cmd), version, output.strip() if success else ""
+    return None
+
 def check_esptool():
     """Check if esptool is available and can detect devices."""
     print("\n🔍 Checking esptool...")
 
-    # Try different esptool commands
-    esptool_commands = ['esptool.py', 'esptool', 'python -m esptool']
-
-    for cmd in esptool_commands:
-        success, output, error = run_command(f"{cmd} version")
-        if success:
-            print(f"✅ Found working esptool: {cmd}")
-            print(f"   Version: {output.strip()}")
+    esptool = probe_esptool()
+    if esptool is None:
+        print("❌ esptool not found or not working")
+        return False
 
-            # Try to list ports
-            print("   Checking for ESP32 devices...")
-            success, output, error = run_command(f"{cmd} --list-ports")
-            if success and output.strip():
-                print(f"   📋 Available ports: {output.strip()}")
-            else:
-                print("   ❌ No ports detected by esptool")
-            return True
+    cmd, version, ports = esptool
+    print(f"✅ Found working esptool: {cmd}")
+    print(f"   Version: {version}")
 
-    print("❌ esptool not found or not working")
-    return False
+    # Report the listed ports
+    print("   Checking for ESP32 devices...")
+    if ports:
+        print(f"   📋 Available ports: {ports}")
+    else:
+        print("   ❌ No ports detected by esptool")
+    return True
 
 def provide_troubleshooting():
     """Provide troubleshooting steps."""
@@ -149,6 +301,13 @@ def main():
     print("ESP32 CYD Device Detection")
     print("=" * 30)
 
+    # Run the probes concurrently, they mostly wait on subprocesses. The
+    # results are cached, so the checks below print them in a fixed order.
+    probes = (probe_usb_devices, probe_system_usb, probe_drivers, probe_esptool)
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        for future in [executor.submit(probe) for probe in probes]:
+            future.result()
+
     # Check for devices
     devices = check_usb_devices()
 
@@ -7,17 +7,77 @@ Based on the CYD pin configuration and micropython-ili9341 library.
 """
 
 from machine import Pin, SPI
+import micropython
+from micropython import const
 import time
 import gc
+from array import array
+from stopwatch import format_time_into
 
 # Import the ILI9341 display driver and utilities
 try:
-    from ili9341 import Display, color565
+    from ili9341 import Display
     from xglcd_font import XglcdFont
 except ImportError:
     print("Warning: ili9341 libraries not found. Make sure to install them in /lib/")
 
+# RGB565 colors, inlined as constants by the compiler
+_BLACK = const(0x0000)        # color565(0, 0, 0)
+_WHITE = const(0xFFFF)        # color565(255, 255, 255)
+_RED = const(0xF800)          # color565(255, 0, 0)
+_GREEN = const(0x07E0)        # color565(0, 255, 0)
+_BLUE = const(0x001F)         # color565(0, 0, 255)
+_YELLOW = const(0xFFE0)       # color565(255, 255, 0)
+_CYAN = const(0x07FF)         # color565(0, 255, 255)
+_MAGENTA = const(0xF81F)      # color565(255, 0, 255)
+_GRAY = const(0x8410)         # color565(128, 128, 128)
+_DARK_GRAY = const(0x4208)    # color565(64, 64, 64)
+_LIGHT_GRAY = const(0xC618)   # color565(192, 192, 192)
+
+
+@micropython.viper
+def _fill_row(buf, color: int, count: int):
+    """Write count big-endian RGB565 pixels of color into buf"""
+    p = ptr8(buf)
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    end = count << 1
+    i = 0
+    while i < end:
+        p[i] = hi
+        p[i + 1] = lo
+        i += 2
+
+
+@micropython.viper
+def _hit_box(boxes, n: int, x: int, y: int) -> int:
+    """Return the index of the first inclusive (x0, y0, x1, y1) box containing (x, y), or -1"""
+    p = ptr16(boxes)
+    i = 0
+    while i < n:
+        j = i << 2
+        if p[j] <= x and x <= p[j + 2] and p[j + 1] <= y and y <= p[j + 3]:
+            return i
+        i += 1
+    return -1
+
+
 class DisplayManager:
+    # Color definitions by name, for callers outside the draw paths
+    _COLORS = {
+        'black': _BLACK,
+        'white': _WHITE,
+        'red': _RED,
+        'green': _GREEN,
+        'blue': _BLUE,
+        'yellow': _YELLOW,
+        'cyan': _CYAN,
+        'magenta': _MAGENTA,
+        'gray': _GRAY,
+        'dark_gray': _DARK_GRAY,
+        'light_gray': _LIGHT_GRAY
+    }
+
     def __init__(self):
         print("Initializing display...")
 
@@ -40,31 +100,34 @@ class DisplayManager:
         self.backlight = Pin(21, Pin.OUT)
         self.backlight.on()
 
-        # Color definitions
-        self.colors = {
-            'black': color565(0, 0, 0),
-            'white': color565(255, 255, 255),
-            'red': color565(255, 0, 0),
-            'green': color565(0, 255, 0),
-            'blue': color565(0, 0, 255),
-            'yellow': color565(255, 255, 0),
-            'cyan': color565(0, 255, 255),
-            'magenta': color565(255, 0, 255),
-            'gray': color565(128, 128, 128),
-            'dark_gray': color565(64, 64, 64),
-            'light_gray': color565(192, 192, 192)
-        }
+        # Shared color table
+        self.colors = self._COLORS
 
         # UI Layout constants
         self.screen_width = 320
         self.screen_height = 240
 
+        # One display row of RGB565 pixels, reused by _fast_fill_rect
+        self._row_buf = bytearray(2 * self.screen_width)
+        self._row_mv = memoryview(self._row_buf)
+        self._row_color = 0
+
+        # Reused digit buffer for the formatted time
+        self._time_buf = bytearray(b"00:00:00.000")
+
         # Button areas (x, y, width, height)
         self.buttons = {
             'start_stop': (50, 180, 100, 40),
             'reset': (170, 180, 100, 40)
         }
 
+        # Packed inclusive corners of every button for the hit test
+        self._btn_names = tuple(self.buttons)
+        self._btn_boxes = array('H')
+        for name in self._btn_names:
+            for v in self.get_button_rect(name):
+                self._btn_boxes.append(v)
+
         # Try to load font, fallback to built-in if not available
         try:
             self.large_font = XglcdFont('fonts/Unispace12x24.c', 12, 24)
@@ -74,31 +137,96 @@ class DisplayManager:
             self.large_font = None
             self.font_available = False
 
+        # x offset of each time character as draw_text lays them out, from
+        # the real glyph widths since ':' and '.' are narrower than digits
+        template = self._time_buf.decode()
+        if self.font_available:
+            self._time_offsets = tuple(self.large_font.measure_text(template[:i])
+                                       for i in range(len(template)))
+        else:
+            self._time_offsets = tuple(8 * i for i in range(len(template)))
+
+        # Character cell used for centering text in the fixed layout
+        self._char_w = 12 if self.font_available else 8
+        self._char_h = 24 if self.font_available else 8
+
+        # The title, time and button labels are fixed, so center them once
+        self._title_x = (self.screen_width - len("CYD STOPWATCH") * self._char_w) // 2
+        self._time_x = (self.screen_width - len(self._time_buf) * self._char_w) // 2
+        self._label_pos = {name: {} for name in self.buttons}
+        for name, label in (('start_stop', "Start"), ('start_stop', "Stop"), ('reset', "Reset")):
+            self._button_text_pos(name, label)
+
         # Clear display and show initial screen
-        self.display.clear(self.colors['black'])
+        self.display.clear(_BLACK)
         self.draw_initial_screen()
 
         print("Display initialized!")
 
     def clear_screen(self):
         """Clears the entire display to the background color."""
-        self.display.fill_rectangle(0, 0, self.display.width, self.display.height, self.colors['black'])
+        self.display.fill_rectangle(0, 0, self.display.width, self.display.height, _BLACK)
+
+    def _fast_fill_rect(self, x, y, w, h, color):
+        """Fill an on-screen rectangle by streaming a preallocated pixel row h times
+
+        The address window is set once and the row buffer is only refilled
+        when the color changes, so nothing is allocated per call.
+        """
+        if color != self._row_color:
+            _fill_row(self._row_buf, color, self.screen_width)
+            self._row_color = color
+        line = self._row_mv[:2 * w]
+
+        display = self.display
+        x1 = x + w - 1
+        y1 = y + h - 1
+        if display.offset:
+            x += display.x_offset
+            x1 += display.x_offset
+            y += display.y_offset
+            y1 += display.y_offset
+
+        # Set the address window, then stream the rows as one memory write
+        display.write_cmd(display.SET_COLUMN, x >> 8, x & 0xff, x1 >> 8, x1 & 0xff)
+        display.write_cmd(display.SET_PAGE, y >> 8, y & 0xff, y1 >> 8, y1 & 0xff)
+        display.write_cmd(display.WRITE_RAM)
+        display.dc(1)
+        display.cs(0)
+        write = display.spi.write
+        for _ in range(h):
+            write(line)
+        display.cs(1)
+
+    def _button_text_pos(self, button_name, text):
+        """Return the position that centers text in a button, cached per label"""
+        cache = self._label_pos[button_name]
+        pos = cache.get(text)
+        if pos is None:
+            x, y, w, h = self.buttons[button_name]
+            pos = (x + (w - len(text) * self._char_w) // 2, y + (h - self._char_h) // 2)
+            cache[text] = pos
+        return pos
 
     def draw_initial_screen(self):
         """Draw the initial application screen"""
         # Clear screen
-        self.display.clear(self.colors['black'])
+        self.display.clear(_BLACK)
+
+        # Nothing drawn yet, so the first updates redraw everything
+        self._last_time_buf = None
+        self._last_is_running = False
+        self._last_blink = False
 
         # Draw title
         title = "CYD STOPWATCH"
         if self.font_available:
-            title_x = (self.screen_width - len(title) * 12) // 2
-            self.display.draw_text(title_x, 10, title, self.large_font, self.colors['yellow'])
+            self.display.draw_text(self._title_x, 10, title, self.large_font, _YELLOW)
         else:
             # Fallback to simple text - use draw_text8x8
-            self.display.fill_rectangle(0, 0, self.display.width, self.display.height, self.colors['black'])  # Clear screen
-            self.display.draw_text8x8(60, 110, "Stopwatch", self.colors['yellow'], background=self.colors['black'])
-            self.display.draw_text8x8(20, 150, "Tap to Start", self.colors['yellow'], background=self.colors['black'])
+            self.display.fill_rectangle(0, 0, self.display.width, self.display.height, _BLACK)  # Clear screen
+            self.display.draw_text8x8(60, 110, "Stopwatch", _YELLOW, background=_BLACK)
+            self.display.draw_text8x8(20, 150, "Tap to Start", _YELLOW, background=_BLACK)
 
         # Draw initial time display
         self.draw_time_display("00:00:00.000", False)
@@ -109,91 +237,132 @@ class DisplayManager:
         # Draw status bar
         self.draw_status_bar("Ready", 0)
 
+        # Remember the drawn labels so unchanged ones are not redrawn
+        self._last_left_button = "Start"
+        self._last_status = "Ready"
+        self._last_light_k = 0
+
     def draw_time_display(self, time_str, is_running):
-        """Draw the main time display"""
-        # Clear time area
-        self.display.fill_rectangle(0, 50, self.screen_width, 80, self.colors['black'])
+        """Draw the main time display, redrawing only the characters that changed"""
+        self._draw_time(time_str.encode(), is_running)
+
+    def _draw_time(self, time_buf, is_running):
+        """Draw the time from ASCII bytes, diffing against what is on screen
+
+        The hot update path passes the reused digit buffer straight in, so
+        no string is built unless the whole area has to be redrawn.
+        """
+        last_buf = self._last_time_buf
 
         # Choose color based on running state
-        time_color = self.colors['green'] if is_running else self.colors['white']
+        time_color = _GREEN if is_running else _WHITE
 
-        if self.font_available:
-            # Calculate center position for time
-            time_x = (self.screen_width - len(time_str) * 12) // 2
-            self.display.fill_rectangle(time_x, 70, 200, 50, self.colors['black'])  # Adjust size as needed
-            self.display.draw_text(time_x, 70, time_str, self.large_font, time_color, background=self.colors['black'])
+        # Centered position, precomputed for the usual HH:MM:SS.mmm layout
+        n = len(time_buf)
+        if n == len(self._time_buf):
+            time_x = self._time_x
         else:
-            # Fallback display - use draw_text8x8
-            time_x = (self.screen_width - len(time_str) * 8) // 2
-            self.display.fill_rectangle(time_x, 70, 200, 16, self.colors['black'])  # Clear for 8x8 font (2 lines)
-            self.display.draw_text8x8(time_x, 70, time_str, time_color, background=self.colors['black'])
-
-        # Draw running indicator
-        if is_running:
-            # Blinking dot to indicate running
-            current_ms = time.ticks_ms()
-            if (current_ms // 500) % 2:  # Blink every 500ms
-                self.display.fill_circle(300, 90, 5, self.colors['red'])
+            time_x = (self.screen_width - n * self._char_w) // 2
+
+        offsets = self._time_offsets
+        if (last_buf is None or is_running != self._last_is_running
+                or n != len(last_buf) or n != len(offsets)):
+            # Color or layout changed, redraw the whole time area
+            time_str = time_buf.decode()
+            self._fast_fill_rect(0, 50, self.screen_width, 80, _BLACK)
+
+            if self.font_available:
+                self._fast_fill_rect(time_x, 70, 200, 50, _BLACK)  # Adjust size as needed
+                self.display.draw_text(time_x, 70, time_str, self.large_font, time_color, background=_BLACK)
+            else:
+                # Fallback display - use draw_text8x8
+                self._fast_fill_rect(time_x, 70, 200, 16, _BLACK)  # Clear for 8x8 font (2 lines)
+                self.display.draw_text8x8(time_x, 70, time_str, time_color, background=_BLACK)
+
+            # The clear also erased the running indicator
+            self._last_blink = False
+
+            # Keep a copy, time_buf may be reused by the caller
+            self._last_time_buf = bytearray(time_buf)
+        else:
+            # Only rewrite the character cells that differ; glyphs are drawn
+            # with a background, so no separate clear is needed
+            for i in range(n):
+                c = time_buf[i]
+                if c != last_buf[i]:
+                    last_buf[i] = c
+                    cell_x = time_x + offsets[i]
+                    if self.font_available:
+                        self.display.draw_text(cell_x, 70, chr(c), self.large_font, time_color,
+                                               background=_BLACK, spacing=0)
+                    else:
+                        self.display.draw_text8x8(cell_x, 70, chr(c), time_color,
+                                                  background=_BLACK)
+
+        self._last_is_running = is_running
+
+        # Draw running indicator, a dot blinking every 500ms
+        blink = is_running and (time.ticks_ms() // 500) % 2 == 1
+        if blink != self._last_blink:
+            self.display.fill_circle(300, 90, 5, _RED if blink else _BLACK)
+            self._last_blink = blink
 
     def draw_buttons(self, left_text, right_text):
         """Draw the control buttons"""
         # Start/Stop button
         x, y, w, h = self.buttons['start_stop']
-        self.display.fill_rectangle(x, y, w, h, self.colors['dark_gray'])
-        self.display.draw_rectangle(x, y, w, h, self.colors['white']) # Changed draw_rect to draw_rectangle
+        self._fast_fill_rect(x, y, w, h, _DARK_GRAY)
+        self.display.draw_rectangle(x, y, w, h, _WHITE) # Changed draw_rect to draw_rectangle
 
         # Center text in button
+        text_x, text_y = self._button_text_pos('start_stop', left_text)
         if self.font_available:
-            text_x = x + (w - len(left_text) * 12) // 2 # Assuming 12px width for custom font
-            text_y = y + (h - 24) // 2 # Assuming 24px height for custom font
-            self.display.draw_text(text_x, text_y, left_text, self.large_font, self.colors['white'], background=self.colors['dark_gray'])
+            self.display.draw_text(text_x, text_y, left_text, self.large_font, _WHITE, background=_DARK_GRAY)
         else:
-            text_x = x + (w - len(left_text) * 8) // 2
-            text_y = y + (h - 8) // 2 # Adjusted for 8x8 font
-            self.display.draw_text8x8(text_x, text_y, left_text, self.colors['white'], background=self.colors['dark_gray'])
+            self.display.draw_text8x8(text_x, text_y, left_text, _WHITE, background=_DARK_GRAY)
 
         # Reset button
         x, y, w, h = self.buttons['reset']
-        self.display.fill_rectangle(x, y, w, h, self.colors['dark_gray'])
-        self.display.draw_rectangle(x, y, w, h, self.colors['white']) # Changed draw_rect to draw_rectangle
+        self._fast_fill_rect(x, y, w, h, _DARK_GRAY)
+        self.display.draw_rectangle(x, y, w, h, _WHITE) # Changed draw_rect to draw_rectangle
 
+        text_x, text_y = self._button_text_pos('reset', right_text)
         if self.font_available:
-            text_x = x + (w - len(right_text) * 12) // 2
-            text_y = y + (h - 24) // 2
-            self.display.draw_text(text_x, text_y, right_text, self.large_font, self.colors['white'], background=self.colors['dark_gray'])
+            self.display.draw_text(text_x, text_y, right_text, self.large_font, _WHITE, background=_DARK_GRAY)
         else:
-            text_x = x + (w - len(right_text) * 8) // 2
-            text_y = y + (h - 8) // 2 # Adjusted for 8x8 font
-            self.display.draw_text8x8(text_x, text_y, right_text, self.colors['white'], background=self.colors['dark_gray'])
+            self.display.draw_text8x8(text_x, text_y, right_text, _WHITE, background=_DARK_GRAY)
 
     def draw_status_bar(self, status, light_level):
         """Draw status information at the bottom"""
         # Clear status area
-        self.display.fill_rectangle(0, 230, self.screen_width, 10, self.colors['black'])
+        self._fast_fill_rect(0, 230, self.screen_width, 10, _BLACK)
 
         # Draw status text using 8x8 font
-        self.display.draw_text8x8(5, 230, f"Status: {status}", self.colors['cyan'], background=self.colors['black'])
+        self.display.draw_text8x8(5, 230, f"Status: {status}", _CYAN, background=_BLACK)
 
         # Draw light level indicator using 8x8 font
         light_text = f"Light: {light_level//1000}k"
-        self.display.draw_text8x8(200, 230, light_text, self.colors['cyan'], background=self.colors['black'])
+        self.display.draw_text8x8(200, 230, light_text, _CYAN, background=_BLACK)
 
     def update_stopwatch_display(self, elapsed_time, is_running, light_level):
         """Update the complete stopwatch display"""
-        # Convert elapsed time to formatted string
-        hours = elapsed_time // 3600000
-        minutes = (elapsed_time % 3600000) // 60000
-        seconds = (elapsed_time % 60000) // 1000
-        milliseconds = elapsed_time % 1000
-
-        time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
-
-        # Update time display
-        self.draw_time_display(time_str, is_running)
-
-        # Update button labels based on state
+        # Format elapsed time in place and draw it without building a string
+        if format_time_into(self._time_buf, elapsed_time):
+            self._draw_time(self._time_buf, is_running)
+        else:
+            # 100 hours or more no longer fit the fixed-width buffer
+            hours = elapsed_time // 3600000
+            minutes = (elapsed_time % 3600000) // 60000
+            seconds = (elapsed_time % 60000) // 1000
+            milliseconds = elapsed_time % 1000
+            time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+            self.draw_time_display(time_str, is_running)
+
+        # Update button labels when the state flips
         left_button = "Stop" if is_running else "Start"
-        self.draw_buttons(left_button, "Reset")
+        if left_button != self._last_left_button:
+            self.draw_buttons(left_button, "Reset")
+            self._last_left_button = left_button
 
         # Update status
         if is_running:
@@ -203,15 +372,28 @@ class DisplayManager:
         else:
             status = "Ready"
 
-        self.draw_status_bar(status, light_level)
+        # Redraw the status bar only when its text would change
+        light_k = light_level // 1000
+        if status != self._last_status or light_k != self._last_light_k:
+            self.draw_status_bar(status, light_level)
+            self._last_status = status
+            self._last_light_k = light_k
+
+    def button_at(self, x, y):
+        """Return the name of the button at a touch coordinate, or None"""
+        if x < 0 or y < 0:
+            return None
+        i = _hit_box(self._btn_boxes, len(self._btn_names), x, y)
+        return self._btn_names[i] if i >= 0 else None
 
     def is_button_touched(self, x, y, button_name):
         """Check if a touch coordinate is within a button area"""
-        if button_name not in self.buttons:
-            return False
+        return self.button_at(x, y) == button_name
 
+    def get_button_rect(self, button_name):
+        """Get a button area as inclusive (x0, y0, x1, y1) corners"""
         bx, by, bw, bh = self.buttons[button_name]
-        return bx <= x <= bx + bw and by <= y <= by + bh
+        return (bx, by, bx + bw, by + bh)
 
     def draw_text_centered(self, y, text, color):
         """Draw text centered horizontally"""
@@ -229,11 +411,11 @@ class DisplayManager:
         """Show a temporary message on screen"""
         # Save current screen (simplified)
         # Clear center area
-        self.display.fill_rectangle(50, 100, 220, 40, self.colors['black'])
-        self.display.draw_rectangle(50, 100, 220, 40, self.colors['yellow']) # Changed draw_rect to draw_rectangle
+        self.display.fill_rectangle(50, 100, 220, 40, _BLACK)
+        self.display.draw_rectangle(50, 100, 220, 40, _YELLOW) # Changed draw_rect to draw_rectangle
 
         # Draw message
-        self.draw_text_centered(115, message, self.colors['yellow'])
+        self.draw_text_centered(115, message, _YELLOW)
 
         # Wait and restore (in a real implementation, this would be non-blocking)
         time.sleep_ms(duration_ms)
@@ -241,7 +423,7 @@ class DisplayManager:
     def draw_progress_bar(self, x, y, width, height, percentage, color):
         """Draw a progress bar (useful for showing session progress)"""
         # Draw border
-        self.display.draw_rectangle(x, y, width, height, self.colors['white']) # Changed draw_rect to draw_rectangle
+        self.display.draw_rectangle(x, y, width, height, _WHITE) # Changed draw_rect to draw_rectangle
 
         # Fill progress
         fill_width = int((width - 2) * percentage / 100)
@@ -251,10 +433,10 @@ class DisplayManager:
     def display_large_time(self, time_str, is_running):
         """Display time in large, centered format"""
         # Clear the time area
-        self.display.fill_rectangle(20, 60, 280, 60, self.colors['black'])
+        self.display.fill_rectangle(20, 60, 280, 60, _BLACK)
 
         # Choose color based on state
-        color = self.colors['green'] if is_running else self.colors['cyan']
+        color = _GREEN if is_running else _CYAN
 
         # Calculate character width for centering
         char_width = 16 if self.font_available else 12
@@ -262,17 +444,17 @@ class DisplayManager:
         x_pos = (self.screen_width - text_width) // 2
 
         if self.font_available:
-            self.display.fill_rectangle(x_pos, 80, 200, 50, self.colors['black'])  # Adjust size as needed
-            self.display.draw_text(x_pos, 80, time_str, self.large_font, color, background=self.colors['black'])
+            self.display.fill_rectangle(x_pos, 80, 200, 50, _BLACK)  # Adjust size as needed
+            self.display.draw_text(x_pos, 80, time_str, self.large_font, color, background=_BLACK)
         else:
             # Fallback to built-in font - use draw_text8x8
-            self.display.fill_rectangle(x_pos, 80, 200, 16, self.colors['black'])  # Clear for 8x8 font
-            self.display.draw_text8x8(x_pos, 80, time_str, color, background=self.colors['black'])
+            self.display.fill_rectangle(x_pos, 80, 200, 16, _BLACK)  # Clear for 8x8 font
+            self.display.draw_text8x8(x_pos, 80, time_str, color, background=_BLACK)
 
     def cleanup(self):
         """Clean up display resources"""
         try:
-            self.display.clear(self.colors['black'])
+            self.display.clear(_BLACK)
             self.backlight.off()
         except:
             pass
@@ -12,12 +12,28 @@ Usage:
 """
 
 import argparse
+import hashlib
+import json
 import os
+import shutil
 import sys
-import subprocess
+import time
+import urllib.error
 import urllib.request
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+# esptool runs in-process so its import cost is paid once per session
+try:
+    import esptool
+except ImportError:
+    esptool = None
+
+# pyserial talks to the REPL directly to verify the flash
+try:
+    import serial
+except ImportError:
+    serial = None
 
 
 class Colors:
@@ -31,6 +47,17 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Read size for firmware downloads (urlretrieve uses 8 KiB blocks)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Seconds to wait for the REPL after flashing, and between probes
+VERIFY_TIMEOUT = 5.0
+VERIFY_PROBE_INTERVAL = 0.5
+
+# FatalError message of esptool's verify_flash when the flash contents differ
+FLASH_MISMATCH = "Verify failed"
+
+
 def print_header(text: str) -> None:
     """Print a formatted header"""
     print(f"\n{Colors.PURPLE}{'=' * 60}{Colors.NC}")
@@ -58,55 +85,170 @@ def print_error(text: str) -> None:
     print(f"{Colors.RED}✗ {text}{Colors.NC}")
 
 
-def download_firmware(firmware_url: str, output_path: Path) -> bool:
-    """Download MicroPython firmware"""
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_sha256(actual: str, expected: Optional[str]) -> bool:
+    """Compare a firmware digest against the expected one, if known"""
+    if not expected:
+        print(f"   SHA-256: {actual}")
+        return True
+    if actual != expected.lower():
+        print_error(f"Checksum mismatch: expected {expected}, got {actual}")
+        return False
+    print_success("Firmware checksum verified")
+    return True
+
+
+def firmware_cache_path(version: str) -> Path:
+    """Path of a firmware image in the per-user cache, shared by all checkouts"""
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache_home / "cyd-firmware" / f"micropython-{version}-esp32.bin"
+
+
+def link_local_copy(firmware_path: Path, local_path: Path) -> None:
+    """Hardlink the cached firmware into the working directory"""
+    if local_path.exists():
+        if local_path.samefile(firmware_path):
+            return
+        local_path.unlink()
     try:
-        print_step(f"Downloading firmware from {firmware_url}")
+        os.link(firmware_path, local_path)
+    except OSError:
+        # Different filesystem (or no hardlink support), fall back to a copy
+        shutil.copy2(firmware_path, local_path)
+    print_success(f"Local copy: {local_path}")
+
+
+def download_firmware(firmware_url: str, output_path: Path, sha256: Optional[str] = None) -> bool:
+    """Download MicroPython firmware, reusing the cached copy if unchanged
+
+    The validators of the last download are kept in a sidecar file next to
+    the firmware so a re-run sends a conditional GET and gets a 304 instead
+    of the whole image. The body is written to a .part file and only renamed
+    into place once complete, so an interrupted download is never reused.
+    """
+    headers_path = output_path.with_name(output_path.name + '.headers.json')
+    part_path = output_path.with_name(output_path.name + '.part')
+
+    request = urllib.request.Request(firmware_url)
+    if output_path.exists() and headers_path.exists():
+        try:
+            cached = json.loads(headers_path.read_text())
+        except (OSError, ValueError):
+            cached = {}
+        if cached.get('etag'):
+            request.add_header('If-None-Match', cached['etag'])
+        if cached.get('last_modified'):
+            request.add_header('If-Modified-Since', cached['last_modified'])
 
-        def progress_hook(count, block_size, total_size):
-            percent = int(count * block_size * 100 / total_size)
-            print(f"\r   Progress: {percent}%", end='', flush=True)
+    try:
+        print_step(f"Downloading firmware from {firmware_url}")
 
-        urllib.request.urlretrieve(firmware_url, output_path, progress_hook)
+        with urllib.request.urlopen(request) as resp, open(part_path, 'wb') as out:
+            total = int(resp.headers.get('Content-Length') or 0)
+            downloaded = 0
+            digest = hashlib.sha256()
+
+            # Large reads keep the syscall and progress update count low
+            while chunk := resp.read(DOWNLOAD_CHUNK_SIZE):
+                out.write(chunk)
+                digest.update(chunk)
+                downloaded += len(chunk)
+                if total:
+                    print(f"\r   Progress: {downloaded * 100 // total}%", end='', flush=True)
+
+            out.flush()
+            os.fsync(out.fileno())
+            validators = {
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+            }
         print()  # New line after progress
 
+        if not check_sha256(digest.hexdigest(), sha256):
+            part_path.unlink()
+            return False
+
+        os.replace(part_path, output_path)
+        headers_path.write_text(json.dumps(validators))
+
         print_success(f"Firmware downloaded to {output_path}")
         return True
 
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print_success(f"Firmware unchanged, using cached {output_path}")
+            return check_sha256(file_sha256(output_path), sha256)
+        print_error(f"Failed to download firmware: {e}")
+        return False
+
     except Exception as e:
+        if part_path.exists():
+            part_path.unlink()
         print_error(f"Failed to download firmware: {e}")
         return False
 
 
+def run_esptool(args: List[str]) -> Optional[str]:
+    """Run an esptool command in-process, returns None on success or an error message"""
+    try:
+        esptool.main(args)
+        return None
+    except esptool.FatalError as e:
+        return str(e)
+    except SystemExit as e:
+        # esptool exits on argument errors and some failures
+        return None if not e.code else f"esptool exited with status {e.code}"
+
+
 def verify_esptool() -> bool:
     """Verify esptool is available"""
-    try:
-        result = subprocess.run(['esptool.py', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print_success(f"esptool found: {version}")
-            return True
-        else:
-            print_error("esptool not working properly")
-            return False
-    except FileNotFoundError:
-        print_error("esptool.py not found. Please install it with: pip install esptool")
+    if esptool is None:
+        print_error("esptool not found. Please install it with: pip install esptool")
         return False
 
+    print_success(f"esptool found: {esptool.__version__}")
+    return True
+
+
+def firmware_matches(port: str, firmware_path: Path) -> bool:
+    """Check whether the device already holds this firmware image
+
+    verify_flash has the chip hash the flash region and compares it with the
+    image, which is much faster than erasing and rewriting it.
+    """
+    print_step("Checking whether the firmware on the device is unchanged...")
+    error = run_esptool(['--port', port, '--baud', '460800', 'verify_flash', '0x1000', str(firmware_path)])
+    if error is None:
+        print_success("Device already runs this firmware, skipping flash")
+        return True
+    if FLASH_MISMATCH in error:
+        print("   Firmware differs, flashing")
+    else:
+        # Port, chip or baud problems are not a mismatch, show what went wrong
+        print_warning(f"Could not verify the firmware on the device: {error}")
+    return False
+
 
 def erase_flash(port: str) -> bool:
     """Erase the ESP32 flash"""
     try:
         print_step("Erasing ESP32 flash...")
 
-        cmd = ['esptool.py', '--port', port, 'erase_flash']
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        error = run_esptool(['--port', port, 'erase_flash'])
 
-        if result.returncode == 0:
+        if error is None:
             print_success("Flash erased successfully")
             return True
         else:
-            print_error(f"Flash erase failed: {result.stderr}")
+            print_error(f"Flash erase failed: {error}")
             return False
 
     except Exception as e:
@@ -119,8 +261,7 @@ def flash_firmware(port: str, firmware_path: Path) -> bool:
     try:
         print_step(f"Flashing firmware: {firmware_path}")
 
-        cmd = [
-            'esptool.py',
+        args = [
             '--port', port,
             '--baud', '460800',
             'write_flash',
@@ -129,14 +270,14 @@ def flash_firmware(port: str, firmware_path: Path) -> bool:
             str(firmware_path)
         ]
 
-        print(f"   Command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=False, text=True)
+        print(f"   Command: esptool.py {' '.join(args)}")
+        error = run_esptool(args)
 
-        if result.returncode == 0:
+        if error is None:
             print_success("Firmware flashed successfully!")
             return True
         else:
-            print_error("Firmware flashing failed")
+            print_error(f"Firmware flashing failed: {error}")
             return False
 
     except Exception as e:
@@ -146,51 +287,64 @@ def flash_firmware(port: str, firmware_path: Path) -> bool:
 
 def verify_micropython(port: str) -> bool:
     """Verify MicroPython is working after flashing"""
+    if serial is None:
+        print_warning("pyserial not found, skipping verification")
+        return False
+
     try:
         print_step("Verifying MicroPython installation...")
 
-        # Wait a moment for the device to reset
-        import time
-        time.sleep(2)
+        # The device is still booting after the reset, so keep probing the
+        # REPL until it answers instead of sleeping a fixed time first. The
+        # echoed command line does not contain the joined output string.
+        with serial.Serial(port, 115200, timeout=0.1) as ser:
+            response = b''
+            deadline = time.monotonic() + VERIFY_TIMEOUT
+            next_probe = 0.0
 
-        # Try to connect with mpremote
-        cmd = ['mpremote', 'connect', port, 'eval', 'print("MicroPython OK")']
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            while time.monotonic() < deadline:
+                if time.monotonic() >= next_probe:
+                    ser.write(b'\r\x03\x03print("MicroPython", "OK")\r\n')
+                    next_probe = time.monotonic() + VERIFY_PROBE_INTERVAL
 
-        if result.returncode == 0 and "MicroPython OK" in result.stdout:
-            print_success("MicroPython is working correctly!")
-            return True
-        else:
-            print_warning("MicroPython verification failed, but firmware may still be installed")
-            if result.stderr:
-                print(f"   Error: {result.stderr.strip()}")
-            return False
+                response += ser.read(ser.in_waiting or 1)
+                if b"MicroPython OK" in response:
+                    print_success("MicroPython is working correctly!")
+                    return True
 
-    except subprocess.TimeoutExpired:
         print_warning("MicroPython verification timed out")
+        if response:
+            print(f"   Response: {response.decode('utf-8', errors='ignore').strip()[-200:]}")
         return False
+
     except Exception as e:
         print_warning(f"MicroPython verification failed: {e}")
         return False
 
 
 def get_esp32_firmware_info():
-    """Get information about ESP32 firmware options"""
+    """Get information about ESP32 firmware options
+
+    Set 'sha256' to the published digest of an image to have downloads of
+    it verified; with None the digest is only printed.
+    """
     return {
         'stable': {
             'version': '1.23.0',
             'url': 'https://micropython.org/resources/firmware/ESP32_GENERIC-20240602-v1.23.0.bin',
-            'description': 'Latest stable release (recommended)'
+            'description': 'Latest stable release (recommended)',
+            'sha256': None
         },
         'generic': {
             'version': '1.22.2',
             'url': 'https://micropython.org/resources/firmware/ESP32_GENERIC-20240222-v1.22.2.bin',
-            'description': 'Previous stable release'
+            'description': 'Previous stable release',
+            'sha256': None
         }
     }
 
 
-def select_firmware() -> tuple[str, str]:
+def select_firmware() -> tuple[str, str, Optional[str]]:
     """Let user select firmware version"""
     firmware_info = get_esp32_firmware_info()
 
@@ -212,7 +366,7 @@ def select_firmware() -> tuple[str, str]:
             choice_idx = int(choice) - 1
             if 0 <= choice_idx < len(firmware_info):
                 selected = list(firmware_info.values())[choice_idx]
-                return selected['url'], selected['version']
+                return selected['url'], selected['version'], selected['sha256']
             else:
                 print_error("Invalid choice. Please try again.")
 
@@ -230,6 +384,10 @@ def main():
     parser.add_argument('--firmware', '-f', help='Custom firmware file path')
     parser.add_argument('--no-verify', action='store_true', help='Skip verification after flashing')
     parser.add_argument('--no-erase', action='store_true', help='Skip flash erase (not recommended)')
+    parser.add_argument('--force', action='store_true', help='Flash even if the device already has this firmware')
+    parser.add_argument('--sha256', help='Expected SHA-256 of the downloaded firmware')
+    parser.add_argument('--local-copy', action='store_true',
+                        help='Also link the downloaded firmware into the current directory')
 
     args = parser.parse_args()
 
@@ -249,8 +407,11 @@ def main():
         firmware_url = None
         version = "custom"
     else:
-        firmware_url, version = select_firmware()
-        firmware_path = Path(f"micropython-{version}-esp32.bin")
+        firmware_url, version, sha256 = select_firmware()
+        if args.sha256:
+            sha256 = args.sha256
+        firmware_path = firmware_cache_path(version)
+        firmware_path.parent.mkdir(parents=True, exist_ok=True)
 
     print(f"\n{Colors.BLUE}Using firmware: {version}{Colors.NC}")
     if firmware_url:
@@ -266,10 +427,17 @@ def main():
         sys.exit(0)
 
     try:
-        # Download firmware if needed
-        if firmware_url and not firmware_path.exists():
-            if not download_firmware(firmware_url, firmware_path):
+        # Download firmware, or revalidate the cached copy
+        if firmware_url:
+            if not download_firmware(firmware_url, firmware_path, sha256):
                 sys.exit(1)
+            if args.local_copy:
+                link_local_copy(firmware_path, Path(firmware_path.name))
+
+        # Skip the erase and write when the image is already on the device
+        if not args.force and firmware_matches(args.port, firmware_path):
+            print_header("FIRMWARE UP TO DATE")
+            return
 
         # Erase flash
         if not args.no_erase:
@@ -9,9 +9,14 @@ It provides multiple deployment methods and handles library dependencies.
 
 import os
 import sys
-import subprocess
 import shutil
+import threading
+import hashlib
+import json
+import http.client
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
 def print_header(title):
     """Print a formatted header"""
@@ -23,14 +28,57 @@ def print_step(step, description):
     """Print a numbered step"""
     print(f"\n{step}. {description}")
 
-def check_tool_installed(tool_name):
-    """Check if a command-line tool is installed"""
+# Content hashes of installed files, kept next to them
+MANIFEST_NAME = ".manifest.json"
+
+# Concurrent downloads; each worker reuses one connection per host
+MAX_DOWNLOAD_WORKERS = 4
+
+_connections = threading.local()
+
+def http_get(url):
+    """GET a URL over a kept-alive connection, returns (status, body)"""
+    parts = urlsplit(url)
+    pool = getattr(_connections, "pool", None)
+    if pool is None:
+        pool = _connections.pool = {}
+
+    for attempt in range(2):
+        conn = pool.get(parts.netloc)
+        if conn is None:
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=30)
+            pool[parts.netloc] = conn
+        try:
+            conn.request("GET", parts.path)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            # The server may have closed an idle connection, retry on a new one
+            conn.close()
+            del pool[parts.netloc]
+            if attempt:
+                raise
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file, without reading it into memory"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        while chunk := f.read(1 << 16):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+def load_manifest(path):
+    """Load a manifest file, an unreadable or missing one is empty"""
     try:
-        subprocess.run([tool_name, "--help"],
-                      capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(path, manifest):
+    """Write a manifest file"""
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
 
 def download_libraries():
     """Download required MicroPython libraries"""
@@ -46,49 +94,86 @@ def download_libraries():
         ("xpt2046.py", "https://raw.githubusercontent.com/rdagger/micropython-ili9341/master/xpt2046.py")
     ]
 
-    # Check if we have curl or wget
-    has_curl = check_tool_installed("curl")
-    has_wget = check_tool_installed("wget")
-
-    if not has_curl and not has_wget:
-        print("❌ Neither curl nor wget is available.")
-        print("Please manually download the following files to the 'lib' directory:")
-        for filename, url in libraries:
-            print(f"   {filename}: {url}")
-        return False
-
-    download_tool = "curl" if has_curl else "wget"
-
+    def fetch(filename, url):
+        try:
+            status, body = http_get(url)
+        except (http.client.HTTPException, OSError) as e:
+            return str(e)
+        if status != 200:
+            return f"HTTP {status}"
+
+        # Write to a temporary name so a partial file never counts as installed
+        part_path = lib_dir / (filename + ".part")
+        part_path.write_bytes(body)
+        os.replace(part_path, lib_dir / filename)
+        manifest[filename] = {"url": url, "sha256": hashlib.sha256(body).hexdigest()}
+        return None
+
+    # Skip files whose content still matches what was downloaded last time
+    manifest_path = lib_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    pending = []
     for filename, url in libraries:
         file_path = lib_dir / filename
+        entry = manifest.get(filename)
         if file_path.exists():
-            print(f"   ✓ {filename} already exists")
-            continue
+            if entry is None:
+                # Installed by other means, trust it and remember its hash
+                manifest[filename] = {"url": url, "sha256": file_sha256(file_path)}
+                print(f"   ✓ {filename} already exists")
+                continue
+            if entry.get("url") == url and entry.get("sha256") == file_sha256(file_path):
+                print(f"   ✓ {filename} already exists")
+                continue
+            print(f"   {filename} changed or is incomplete, downloading again...")
+        else:
+            print(f"   Downloading {filename}...")
+        pending.append((filename, url))
 
-        print(f"   Downloading {filename}...")
-        try:
-            if download_tool == "curl":
-                subprocess.run(["curl", "-o", str(file_path), url], check=True)
-            else:
-                subprocess.run(["wget", "-O", str(file_path), url], check=True)
+    if not pending:
+        save_manifest(manifest_path, manifest)
+        return True
+
+    # The downloads are independent and network bound, so run them at once
+    with ThreadPoolExecutor(max_workers=min(len(pending), MAX_DOWNLOAD_WORKERS)) as pool:
+        errors = list(pool.map(lambda item: fetch(*item), pending))
+    save_manifest(manifest_path, manifest)
+
+    success = True
+    for (filename, url), error in zip(pending, errors):
+        if error is None:
             print(f"   ✓ Downloaded {filename}")
-        except subprocess.CalledProcessError:
-            print(f"   ❌ Failed to download {filename}")
-            return False
+        else:
+            print(f"   ❌ Failed to download {filename}: {error}")
+            success = False
 
-    return True
+    if not success:
+        print("Please manually download the missing files to the 'lib' directory:")
+        for (filename, url), error in zip(pending, errors):
+            if error is not None:
+                print(f"   {filename}: {url}")
+
+    return success
+
+def link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead where links are not possible"""
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Another filesystem, or one without hardlink support
+        shutil.copy2(src, dst)
 
 def create_deployment_package():
-    """Create a deployment package with all necessary files"""
-    print_step("2", "Creating deployment package...")
+    """Create a deployment package with all necessary files
 
-    # Create deployment directory
-    deploy_dir = Path("deploy")
-    if deploy_dir.exists():
-        shutil.rmtree(deploy_dir)
-    deploy_dir.mkdir()
+    Files are hardlinked into the staging directory rather than copied, and
+    only the ones whose content changed since the last run are touched,
+    based on the content hashes recorded in deploy/.manifest.json.
+    """
+    print_step("2", "Creating deployment package...")
 
-    # Copy application files
+    # Application files
     app_files = [
         "main.py",
         "stopwatch.py",
@@ -97,99 +182,67 @@ def create_deployment_package():
         "boot.py"
     ]
 
+    sources = []
     for file in app_files:
         src = Path(file)
-        if src.exists():
-            shutil.copy2(src, deploy_dir / file)
-            print(f"   ✓ Copied {file}")
-        else:
+        if not src.exists():
             print(f"   ❌ Missing {file}")
             return False
+        sources.append((src, file))
 
-    # Copy lib directory if it exists
+    # Library files, without download bookkeeping or host bytecode caches
     lib_dir = Path("lib")
     if lib_dir.exists():
-        shutil.copytree(lib_dir, deploy_dir / "lib")
-        print("   ✓ Copied lib directory")
+        for src in sorted(lib_dir.rglob("*")):
+            if (src.is_file() and src.name != MANIFEST_NAME and src.suffix != ".part"
+                    and "__pycache__" not in src.parts):
+                sources.append((src, src.as_posix()))
+
+    # Without a manifest the directory contents are unknown, start over
+    deploy_dir = Path("deploy")
+    manifest_path = deploy_dir / MANIFEST_NAME
+    if deploy_dir.exists() and not manifest_path.exists():
+        shutil.rmtree(deploy_dir)
+    deploy_dir.mkdir(exist_ok=True)
+    old_manifest = load_manifest(manifest_path)
+
+    manifest = {}
+    copied = 0
+    for src, name in sources:
+        digest = file_sha256(src)
+        manifest[name] = digest
+        dst = deploy_dir / name
+        if old_manifest.get(name) == digest and dst.exists():
+            continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        link_or_copy(src, dst)
+        print(f"   ✓ Added {name}")
+        copied += 1
 
+    # Drop files that are no longer part of the package
+    for name in old_manifest.keys() - manifest.keys():
+        (deploy_dir / name).unlink(missing_ok=True)
+
+    save_manifest(manifest_path, manifest)
+    print(f"   ✓ {len(sources) - copied} files unchanged")
     print(f"   ✓ Deployment package created in '{deploy_dir}'")
     return True
 
+def print_text(name):
+    """Print one of the text files shipped next to this script"""
+    print((Path(__file__).parent / name).read_text(encoding="utf-8"))
+
 def show_deployment_instructions():
     """Show manual deployment instructions"""
     print_step("3", "Deployment Instructions")
 
-    print("""
-🔧 METHOD 1: Using Thonny IDE (Recommended for beginners)
-   1. Install Thonny: https://thonny.org/
-   2. Connect your CYD via USB-C cable
-   3. In Thonny: Tools → Options → Interpreter
-   4. Select "MicroPython (ESP32)" and your device port
-   5. Open each .py file and save to device (File → Save as... → MicroPython device)
-   6. Reset your CYD - the application will start automatically
-
-🔧 METHOD 2: Using mpremote (Command line)
-   1. Install: pip install mpremote
-   2. Connect your CYD and run:
-      mpremote connect [PORT] fs cp deploy/* :
-   3. Reset your device
-
-🔧 METHOD 3: Using ampy (Legacy tool)
-   1. Install: pip install adafruit-ampy
-   2. Set port: export AMPY_PORT=/dev/ttyUSB0  # (or your device port)
-   3. Upload files:
-      ampy put deploy/main.py main.py
-      ampy put deploy/stopwatch.py stopwatch.py
-      ampy put deploy/display_manager.py display_manager.py
-      ampy put deploy/touch_handler.py touch_handler.py
-      ampy put deploy/boot.py boot.py
-      ampy mkdir lib
-      ampy put deploy/lib/ili9341.py lib/ili9341.py
-      ampy put deploy/lib/xglcd_font.py lib/xglcd_font.py
-      ampy put deploy/lib/xpt2046.py lib/xpt2046.py
-
-📱 FINDING YOUR DEVICE PORT:
-   • macOS: /dev/cu.usbserial-* or /dev/cu.wchusbserial*
-   • Linux: /dev/ttyUSB* or /dev/ttyACM*
-   • Windows: COM* (check Device Manager)
-
-🚨 TROUBLESHOOTING:
-   • If display is blank: Check if backlight pin is working
-   • If touch doesn't work: Verify touch libraries are in /lib
-   • If imports fail: Ensure all libraries are properly installed
-   • For CYD2USB: Use inverted display settings (see README.md)
-""")
+    print_text("install_instructions.txt")
 
 def show_usage_instructions():
     """Show how to use the stopwatch application"""
     print_step("4", "How to Use the Stopwatch")
 
-    print("""
-🎯 CONTROLS:
-   • LEFT BUTTON: Start/Stop the stopwatch
-   • RIGHT BUTTON: Reset to 00:00:00.000
-
-📊 DISPLAY:
-   • Large time display shows HH:MM:SS.mmm format
-   • Status bar shows current state and light level
-   • RGB LED on back indicates status:
-     - BLUE: Ready/Idle
-     - GREEN: Running
-     - RED: Stopped
-
-⚡ FEATURES:
-   • High precision timing (millisecond accuracy)
-   • Handles long timing sessions (hours+)
-   • Touch screen interface
-   • Ambient light sensor display
-   • Modern, easy-to-read UI
-
-🔧 ADVANCED:
-   • The stopwatch accumulates time across start/stop cycles
-   • Reset clears all accumulated time
-   • Application handles timer overflow for very long sessions
-   • Memory management prevents crashes during extended use
-""")
+    print_text("install_usage.txt")
 
 def main():
     """Main installation process"""
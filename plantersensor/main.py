@@ -14,57 +14,96 @@ Features:
 - RGB LED status indicators
 """
 
-import time
 import gc
-from machine import Pin, ADC
+import time
+from micropython import const
+from machine import Pin, ADC, Timer, mem32
 from stopwatch import Stopwatch
 from display_manager import DisplayManager
 from touch_handler import TouchHandler
 
 # Load configuration
 try:
-    import config
+    from config import (DISPLAY_UPDATE_INTERVAL, LED_ENABLED, SHOW_LIGHT_SENSOR,
+                        DEBUG_MODE, PIN_LED_RED, PIN_LED_GREEN, PIN_LED_BLUE,
+                        PIN_LIGHT_SENSOR, WEB_MONITOR_ENABLED, WIFI_SSID,
+                        WIFI_PASSWORD, WEB_SERVER_PORT)
 except ImportError:
     # Fallback configuration if config.py not found
-    class config:
-        DISPLAY_UPDATE_INTERVAL = 100
-        TOUCH_DEBOUNCE_MS = 200
-        LED_ENABLED = True
-        SHOW_MILLISECONDS = True
-        SHOW_LIGHT_SENSOR = True
-        MEMORY_MANAGEMENT = True
-        DEBUG_MODE = False
-        STARTUP_DELAY_MS = 100
+    DISPLAY_UPDATE_INTERVAL = 100
+    LED_ENABLED = True
+    SHOW_LIGHT_SENSOR = True
+    DEBUG_MODE = False
+    PIN_LED_RED = 4
+    PIN_LED_GREEN = 16
+    PIN_LED_BLUE = 17
+    PIN_LIGHT_SENSOR = 34
+    WEB_MONITOR_ENABLED = False
+    WIFI_SSID = ""
+    WIFI_PASSWORD = ""
+    WEB_SERVER_PORT = 80
+
+# ESP32 GPIO output write-1-to-set / write-1-to-clear registers (GPIO 0-31)
+_GPIO_OUT_W1TS = const(0x3FF44008)
+_GPIO_OUT_W1TC = const(0x3FF4400C)
 
 class StopwatchApp:
     def __init__(self):
         print("Starting CYD Stopwatch Application...")
 
-        # Initialize components
-        self.stopwatch = Stopwatch()
+        # Initialize components, long-lived buffers first so they pack
+        # together at one end of the heap instead of around small objects
+        gc.collect()
         self.display = DisplayManager()
+        gc.collect()
         self.touch = TouchHandler()
+        self.stopwatch = Stopwatch()
 
         # Initialize RGB LED pins (active low)
-        if config.LED_ENABLED:
-            self.red_led = Pin(4, Pin.OUT, value=1)    # Off initially
-            self.green_led = Pin(16, Pin.OUT, value=1)  # Off initially
-            self.blue_led = Pin(17, Pin.OUT, value=1)   # Off initially
+        if LED_ENABLED:
+            self.red_led = Pin(PIN_LED_RED, Pin.OUT, value=1)      # Off initially
+            self.green_led = Pin(PIN_LED_GREEN, Pin.OUT, value=1)  # Off initially
+            self.blue_led = Pin(PIN_LED_BLUE, Pin.OUT, value=1)    # Off initially
+
+            # GPIO bit masks so a state change is two register writes
+            self._led_mask = (1 << PIN_LED_RED) | (1 << PIN_LED_GREEN) | (1 << PIN_LED_BLUE)
+            self._led_bits = {
+                'ready': 1 << PIN_LED_BLUE,      # Blue for ready state
+                'running': 1 << PIN_LED_GREEN,   # Green for running
+                'stopped': 1 << PIN_LED_RED,     # Red for stopped
+            }
         else:
             self.red_led = self.green_led = self.blue_led = None
+            self._led_mask = 0
 
         # Initialize light sensor
-        if config.SHOW_LIGHT_SENSOR:
-            self.light_sensor = ADC(Pin(34))
-            self.light_sensor.atten(ADC.ATTN_11DB)  # For 0-3.3V range
+        if SHOW_LIGHT_SENSOR:
+            # 11dB attenuation for the 0-3.3V range, set at construction
+            self.light_sensor = ADC(Pin(PIN_LIGHT_SENSOR), atten=ADC.ATTN_11DB)
         else:
             self.light_sensor = None
 
+        # Bound read method, created once instead of on every frame
+        self._light_read = self.light_sensor.read if self.light_sensor else None
+
+        # Smoothed light level, seeded with a first reading
+        self._light_ema = self._light_read() if self._light_read else 0
+
         # Application state
         self.running = True
-        self.last_update = time.ticks_ms()
-        self.update_interval = config.DISPLAY_UPDATE_INTERVAL
-        self.gc_counter = 0
+        self.update_interval = DISPLAY_UPDATE_INTERVAL
+
+        # Hardware timer flags when the next display frame is due
+        self._need_update = True
+        self._tick = Timer(0)
+
+        # Optional web monitor, served from the main loop
+        self.web_monitor = None
+        if WEB_MONITOR_ENABLED:
+            from web_monitor import WebMonitor
+            web_monitor = WebMonitor(self, WIFI_SSID, WIFI_PASSWORD)
+            if web_monitor.connect_wifi() and web_monitor.start_server(WEB_SERVER_PORT):
+                self.web_monitor = web_monitor
 
         # Set initial LED state (blue = ready)
         self.set_led_state('ready')
@@ -73,29 +112,27 @@ class StopwatchApp:
 
     def set_led_state(self, state):
         """Set RGB LED based on stopwatch state"""
-        # Turn off all LEDs first (active low)
-        self.red_led.on()
-        self.green_led.on()
-        self.blue_led.on()
-
-        if state == 'ready':
-            self.blue_led.off()  # Blue for ready state
-        elif state == 'running':
-            self.green_led.off()  # Green for running
-        elif state == 'stopped':
-            self.red_led.off()   # Red for stopped
+        if not self._led_mask:
+            return
+
+        # Active low: drive the other LEDs high (off), then pull the state's
+        # LED low (on)
+        on = self._led_bits.get(state, 0)
+        mem32[_GPIO_OUT_W1TS] = self._led_mask ^ on
+        if on:
+            mem32[_GPIO_OUT_W1TC] = on
 
     def read_light_level(self):
         """Read light sensor value"""
+        if self._light_read is None:
+            return 0
+
         try:
-            # Take multiple readings for stability
-            readings = []
-            for _ in range(5):
-                readings.append(self.light_sensor.read())
-                time.sleep_ms(2)
-
-            # Return average reading
-            return sum(readings) // len(readings)
+            # One reading per frame, smoothed by an exponential moving
+            # average (alpha = 1/8) instead of blocking on several reads
+            sample = self._light_read()
+            self._light_ema += (sample - self._light_ema) >> 3
+            return self._light_ema
         except:
             return 0
 
@@ -104,24 +141,33 @@ class StopwatchApp:
         touch_coords = self.touch.get_touch()
         if touch_coords:
             x, y = touch_coords
-            print(f"Touch detected at: ({x}, {y})")
+            if DEBUG_MODE:
+                print(f"Touch detected at: ({x}, {y})")
 
             # Check which button was pressed
-            if self.display.is_button_touched(x, y, 'start_stop'):
+            button = self.display.button_at(x, y)
+            if button == 'start_stop':
                 if self.stopwatch.is_running():
                     self.stopwatch.stop()
                     self.set_led_state('stopped')
-                    print("Stopwatch stopped")
+                    if DEBUG_MODE:
+                        print("Stopwatch stopped")
                     self.show_statistics()
                 else:
                     self.stopwatch.start()
                     self.set_led_state('running')
-                    print("Stopwatch started")
+                    if DEBUG_MODE:
+                        print("Stopwatch started")
 
-            elif self.display.is_button_touched(x, y, 'reset'):
+            elif button == 'reset':
                 self.stopwatch.reset()
                 self.set_led_state('ready')
-                print("Stopwatch reset")
+                if DEBUG_MODE:
+                    print("Stopwatch reset")
+
+    def _on_tick(self, timer):
+        """Timer callback, marks a display update as due"""
+        self._need_update = True
 
     def update_display(self):
         """Update the display with current stopwatch state"""
@@ -146,6 +192,9 @@ class StopwatchApp:
 
     def show_statistics(self):
         """Show timing statistics when stopwatch is stopped"""
+        if not DEBUG_MODE:
+            return
+
         if not self.stopwatch.is_running() and self.stopwatch.get_elapsed_time() > 0:
             elapsed = self.stopwatch.get_elapsed_time()
 
@@ -159,26 +208,33 @@ class StopwatchApp:
         """Main application loop"""
         print("Starting main application loop...")
 
+        # Bind hot-loop lookups to locals once
+        sleep_ms = time.sleep_ms
+        handle_touch = self.handle_touch_input
+        update_display = self.update_display
+        web_tick = self.web_monitor.tick if self.web_monitor else None
+
+        # Pace display updates from the hardware timer
+        self._tick.init(period=self.update_interval, mode=Timer.PERIODIC,
+                        callback=self._on_tick)
+
         try:
             while self.running:
-                current_time = time.ticks_ms()
-
                 # Handle touch input
-                self.handle_touch_input()
+                handle_touch()
 
-                # Update display at regular intervals
-                if time.ticks_diff(current_time, self.last_update) >= self.update_interval:
-                    self.update_display()
-                    self.last_update = current_time
+                # Update display when the timer says a frame is due
+                if self._need_update:
+                    self._need_update = False
+                    update_display()
 
-                    # Periodic garbage collection every 50 updates (~5 seconds)
-                    self.gc_counter += 1
-                    if self.gc_counter >= 50:
-                        gc.collect()
-                        self.gc_counter = 0
+                # Serve a waiting web client, returns at once otherwise
+                if web_tick:
+                    web_tick()
 
-                # Small delay to prevent excessive CPU usage
-                time.sleep_ms(10)
+                # Idle until the next touch poll; on the ESP32 this is a
+                # FreeRTOS delay, so the core halts instead of spinning
+                sleep_ms(10)
 
         except KeyboardInterrupt:
             print("\nKeyboard interrupt received. Shutting down...")
@@ -194,10 +250,16 @@ class StopwatchApp:
         """Clean up resources before exit"""
         print("Cleaning up application...")
         try:
-            # Turn off all LEDs
-            self.red_led.on()
-            self.green_led.on()
-            self.blue_led.on()
+            # Stop the display timer
+            self._tick.deinit()
+
+            # Stop the web monitor
+            if self.web_monitor:
+                self.web_monitor.stop_server()
+
+            # Turn off all LEDs (active low)
+            if self._led_mask:
+                mem32[_GPIO_OUT_W1TS] = self._led_mask
 
             # Clean up display
             self.display.cleanup()
@@ -0,0 +1,29 @@
+# CYD Stopwatch - Frozen Firmware Manifest
+# ========================================
+#
+# Freezes the application modules and display/touch drivers into a custom
+# ESP32 firmware image. Frozen bytecode executes in place from flash, so
+# importing these modules costs no filesystem reads and no heap for code.
+#
+# Build from the MicroPython source tree:
+#   cd micropython/ports/esp32
+#   make BOARD=ESP32_GENERIC FROZEN_MANIFEST=/path/to/plantersensor/manifest.py
+#
+# boot.py and main.py stay on the filesystem because MicroPython only runs
+# them from there. A .py or .mpy copy of a frozen module left on the device
+# shadows the frozen one, so remove them (or edit config.py on the device on
+# purpose to override the frozen settings).
+
+# Keep the standard ESP32 frozen modules (asyncio, network helpers, ...)
+include("$(PORT_DIR)/boards/manifest.py")
+
+# Application modules
+module("stopwatch.py")
+module("display_manager.py")
+module("touch_handler.py")
+module("config.py")
+
+# Display and touch drivers
+module("ili9341.py", base_path="lib")
+module("xglcd_font.py", base_path="lib")
+module("xpt2046.py", base_path="lib")
@@ -336,22 +336,13 @@ case "$METHOD" in
             exit 1
         fi
 
-        # Deploy Python files
-        print_step "Copying Python files..."
-        if mpremote connect "$PORT" fs cp *.py :; then
-            print_success "Python files deployed"
-        else
-            print_error "Failed to deploy Python files"
-            exit 1
-        fi
-
-        # Create lib directory and deploy libraries
-        print_step "Creating lib directory and copying libraries..."
-        mpremote connect "$PORT" fs mkdir lib 2>/dev/null || true
-        if mpremote connect "$PORT" fs cp lib/* :lib/; then
-            print_success "Libraries deployed"
+        # Deploy Python files and libraries in one mpremote session, so the
+        # device is connected (and interrupted) only once. cp -r creates lib/
+        print_step "Copying Python files and libraries..."
+        if mpremote connect "$PORT" fs cp *.py : + fs cp -r lib :; then
+            print_success "Python files and libraries deployed"
         else
-            print_error "Failed to deploy libraries"
+            print_error "Failed to deploy files"
             exit 1
         fi
 
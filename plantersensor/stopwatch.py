@@ -3,64 +3,175 @@ Stopwatch Module for CYD Planter Sensor
 ========================================
 
 Handles timing functionality with proper overflow handling for long duration timing.
-Uses time.ticks_ms() with ticks_diff() for accurate timing that handles wraparound.
+Uses time.ticks_us() with ticks_diff() for microsecond resolution that handles
+wraparound. Elapsed time is folded into the total on every read, so each
+ticks_diff() spans well under the ~9 minute ticks_us() half-period.
 """
 
 import time
+from array import array
+
+try:
+    import micropython
+    from micropython import const
+    native = micropython.native
+except ImportError:
+    def const(value):
+        return value
+
+    def native(func):
+        return func
+
+try:
+    from config import DEBUG_MODE
+except ImportError:
+    DEBUG_MODE = False
+
+# Slots of the packed stopwatch state
+_START_US = const(0)    # ticks_us() at the last accumulation
+_TOTAL_MS = const(1)    # Whole milliseconds elapsed
+_REM_US = const(2)      # Sub-millisecond remainder of the total
+_LAP_MS = const(3)      # Total ms when the current session started
+_LAP_REM_US = const(4)  # Sub-millisecond remainder at session start
+_RUNNING = const(5)     # 1 while running, 0 when stopped
+
+
+@native
+def format_time_into(buf, elapsed):
+    """Write elapsed ms into buf as HH:MM:SS.mmm, returns False if hours exceed 99
+
+    buf must already hold the ':' and '.' separators, only digits are written.
+    """
+    hours = elapsed // 3600000
+    if hours > 99:
+        return False
+    rest = elapsed - hours * 3600000
+    minutes = rest // 60000
+    rest -= minutes * 60000
+    seconds = rest // 1000
+    milliseconds = rest - seconds * 1000
+
+    buf[0] = 48 + hours // 10
+    buf[1] = 48 + hours % 10
+    buf[3] = 48 + minutes // 10
+    buf[4] = 48 + minutes % 10
+    buf[6] = 48 + seconds // 10
+    buf[7] = 48 + seconds % 10
+    buf[9] = 48 + milliseconds // 100
+    buf[10] = 48 + (milliseconds // 10) % 10
+    buf[11] = 48 + milliseconds % 10
+    return True
+
 
 class Stopwatch:
     def __init__(self):
-        self.start_time = 0
-        self.total_elapsed = 0
-        self.running = False
+        # All timing state lives in one packed int array, see the slots above
+        self._s = array('i', [0, 0, 0, 0, 0, 0])
+
+        # Reused buffer for the 'full' format, digits are written in place
+        self._time_buf = bytearray(b"00:00:00.000")
+
+        # Single-slot cache of the last 'full' string, keyed on elapsed ms
+        self._fmt_cache_key = -1
+        self._fmt_cache_val = None
 
     def start(self):
         """Start the stopwatch"""
-        if not self.running:
-            self.start_time = time.ticks_ms()
-            self.running = True
-            print("Stopwatch started")
+        s = self._s
+        if not s[_RUNNING]:
+            s[_START_US] = time.ticks_us()
+            s[_LAP_MS] = s[_TOTAL_MS]
+            s[_LAP_REM_US] = s[_REM_US]
+            s[_RUNNING] = 1
+            if DEBUG_MODE:
+                print("Stopwatch started")
 
     def stop(self):
         """Stop the stopwatch and accumulate elapsed time"""
-        if self.running:
-            current_time = time.ticks_ms()
-            elapsed = time.ticks_diff(current_time, self.start_time)
-            self.total_elapsed += elapsed
-            self.running = False
-            print(f"Stopwatch stopped. Session time: {elapsed}ms")
+        s = self._s
+        if s[_RUNNING]:
+            self._accumulate(s)
+            s[_RUNNING] = 0
+            if DEBUG_MODE:
+                print(f"Stopwatch stopped. Session time: {self._session_us(s) // 1000}ms")
 
     def reset(self):
         """Reset the stopwatch to zero"""
-        self.start_time = 0
-        self.total_elapsed = 0
-        self.running = False
-        print("Stopwatch reset")
+        s = self._s
+        for i in range(len(s)):
+            s[i] = 0
+        if DEBUG_MODE:
+            print("Stopwatch reset")
+
+    def _accumulate(self, s):
+        """Fold the time since the start stamp into the total"""
+        current_time = time.ticks_us()
+        elapsed_us = s[_REM_US] + time.ticks_diff(current_time, s[_START_US])
+        s[_START_US] = current_time
+
+        # Keep the total in ms so it fits the array for days of timing
+        elapsed_ms, s[_REM_US] = divmod(elapsed_us, 1000)
+        s[_TOTAL_MS] += elapsed_ms
+
+    def _session_us(self, s):
+        """Microseconds accumulated since the last start/resume"""
+        return (s[_TOTAL_MS] - s[_LAP_MS]) * 1000 + s[_REM_US] - s[_LAP_REM_US]
 
     def get_elapsed_time(self):
         """Get total elapsed time in milliseconds"""
-        if self.running:
-            current_time = time.ticks_ms()
-            current_session = time.ticks_diff(current_time, self.start_time)
-            return self.total_elapsed + current_session
-        else:
-            return self.total_elapsed
+        s = self._s
+        if s[_RUNNING]:
+            self._accumulate(s)
+        return s[_TOTAL_MS]
+
+    def get_elapsed_us(self):
+        """Get total elapsed time in microseconds"""
+        s = self._s
+        if s[_RUNNING]:
+            self._accumulate(s)
+        return s[_TOTAL_MS] * 1000 + s[_REM_US]
+
+    def set_elapsed_time(self, elapsed_ms):
+        """Set the total elapsed time in milliseconds, e.g. to restore a session"""
+        s = self._s
+        s[_TOTAL_MS] = elapsed_ms
+        s[_REM_US] = 0
+        s[_LAP_MS] = elapsed_ms
+        s[_LAP_REM_US] = 0
+        if s[_RUNNING]:
+            s[_START_US] = time.ticks_us()
 
     def is_running(self):
         """Check if stopwatch is currently running"""
-        return self.running
+        return self._s[_RUNNING] == 1
 
-    def get_formatted_time(self, format_type='full'):
-        """Get formatted time string"""
+    def _components(self):
+        """Get (hours, minutes, seconds, milliseconds, total_ms) of the elapsed time"""
         elapsed = self.get_elapsed_time()
 
-        hours = elapsed // 3600000
-        minutes = (elapsed % 3600000) // 60000
-        seconds = (elapsed % 60000) // 1000
-        milliseconds = elapsed % 1000
+        # Each divmod reuses the previous quotient
+        seconds, milliseconds = divmod(elapsed, 1000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+
+        return hours, minutes, seconds, milliseconds, elapsed
+
+    def get_formatted_time(self, format_type='full', components=None):
+        """Get formatted time string
+
+        components may be passed in from _components() to avoid recomputing them.
+        """
+        hours, minutes, seconds, milliseconds, elapsed = components or self._components()
 
         if format_type == 'full':
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+            if elapsed == self._fmt_cache_key:
+                return self._fmt_cache_val
+            buf = self._time_buf
+            if not format_time_into(buf, elapsed):
+                return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+            self._fmt_cache_key = elapsed
+            self._fmt_cache_val = buf.decode()
+            return self._fmt_cache_val
         elif format_type == 'short':
             if hours > 0:
                 return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
@@ -78,32 +189,29 @@ class Stopwatch:
 
     def get_session_stats(self):
         """Get statistics about the current timing session"""
-        elapsed = self.get_elapsed_time()
+        components = self._components()
+        hours, minutes, seconds, milliseconds, elapsed = components
         return {
             'total_ms': elapsed,
-            'hours': elapsed // 3600000,
-            'minutes': (elapsed % 3600000) // 60000,
-            'seconds': (elapsed % 60000) // 1000,
-            'milliseconds': elapsed % 1000,
-            'is_running': self.running,
-            'formatted': self.get_formatted_time()
+            'hours': hours,
+            'minutes': minutes,
+            'seconds': seconds,
+            'milliseconds': milliseconds,
+            'is_running': self.is_running(),
+            'formatted': self.get_formatted_time(components=components)
         }
 
     def lap_time(self):
         """Get current lap time (time since start/resume)"""
-        if self.running:
-            current_time = time.ticks_ms()
-            return time.ticks_diff(current_time, self.start_time)
+        s = self._s
+        if s[_RUNNING]:
+            self._accumulate(s)
+            return self._session_us(s) // 1000
         return 0
 
     def get_time_components(self):
         """Get time as separate components for display"""
-        total_ms = self.get_elapsed_time()
-
-        hours = total_ms // 3600000
-        minutes = (total_ms % 3600000) // 60000
-        seconds = (total_ms % 60000) // 1000
-        milliseconds = total_ms % 1000
+        hours, minutes, seconds, milliseconds, total_ms = self._components()
 
         return {
             'hours': hours,
@@ -16,12 +16,15 @@ Usage:
 """
 
 import argparse
+import io
+import os
+import re
+import shutil
 import sys
-import time
-import serial
-import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional, TextIO, Tuple
 
 
 class Colors:
@@ -35,238 +38,305 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
-def print_header(text: str) -> None:
+# Plain text when the output is redirected to a file or pipe
+if not sys.stdout.isatty():
+    for _name in ('RED', 'GREEN', 'YELLOW', 'BLUE', 'PURPLE', 'CYAN', 'NC'):
+        setattr(Colors, _name, '')
+
+# Message envelopes, built once instead of formatted on every call
+_HEADER_RULE = f"{Colors.PURPLE}{'=' * 50}{Colors.NC}\n"
+_STEP_PREFIX = f"{Colors.CYAN}➤ "
+_SUCCESS_PREFIX = f"{Colors.GREEN}✓ "
+_WARNING_PREFIX = f"{Colors.YELLOW}⚠ "
+_ERROR_PREFIX = f"{Colors.RED}✗ "
+_SUFFIX = f"{Colors.NC}\n"
+
+
+def print_header(text: str, out: Optional[TextIO] = None) -> None:
     """Print a formatted header"""
-    print(f"\n{Colors.PURPLE}{'=' * 50}{Colors.NC}")
-    print(f"{Colors.PURPLE} {text}{Colors.NC}")
-    print(f"{Colors.PURPLE}{'=' * 50}{Colors.NC}\n")
+    (out or sys.stdout).write(f"\n{_HEADER_RULE}{Colors.PURPLE} {text}{_SUFFIX}{_HEADER_RULE}\n")
 
 
-def print_step(text: str) -> None:
+def print_step(text: str, out: Optional[TextIO] = None) -> None:
     """Print a step message"""
-    print(f"{Colors.CYAN}➤ {text}{Colors.NC}")
+    (out or sys.stdout).write(_STEP_PREFIX + text + _SUFFIX)
 
 
-def print_success(text: str) -> None:
+def print_success(text: str, out: Optional[TextIO] = None) -> None:
     """Print a success message"""
-    print(f"{Colors.GREEN}✓ {text}{Colors.NC}")
+    (out or sys.stdout).write(_SUCCESS_PREFIX + text + _SUFFIX)
 
 
-def print_warning(text: str) -> None:
+def print_warning(text: str, out: Optional[TextIO] = None) -> None:
     """Print a warning message"""
-    print(f"{Colors.YELLOW}⚠ {text}{Colors.NC}")
+    (out or sys.stdout).write(_WARNING_PREFIX + text + _SUFFIX)
 
 
-def print_error(text: str) -> None:
+def print_error(text: str, out: Optional[TextIO] = None) -> None:
     """Print an error message"""
-    print(f"{Colors.RED}✗ {text}{Colors.NC}")
+    (out or sys.stdout).write(_ERROR_PREFIX + text + _SUFFIX)
+
+
+# Printed after each batched REPL submission; the device assembles it at
+# runtime, so the echo of the submitted line never contains it
+REPL_SENTINEL = b"===END==="
+
+# Resolved once, the same for every port tested
+MPREMOTE_PATH = shutil.which('mpremote')
+
+# Friendly REPL prompt, read up to instead of sleeping after control keys
+REPL_PROMPT = b'>>> '
+
+# "Key: value" lines reported by the hardware info probe
+HARDWARE_INFO_RE = re.compile(rb'^(Python|Free memory|Frequency|Flash size):[ \t]*(.*?)\s*$', re.M)
+
+# "<lib>_OK" or "<lib>_ERROR: <message>" lines reported by the library probe
+LIB_STATUS_RE = re.compile(rb'^(\w+?)_(OK|ERROR):?[ \t]*(.*?)\s*$', re.M)
+
+
+def reset_repl(ser: 'serial.Serial') -> None:
+    """Stop any running code and soft reset to a clean REPL
 
+    Each step waits for the device to answer instead of a fixed sleep. The
+    second Ctrl+C stops main.py from taking over after the soft reboot.
+    """
+    ser.write(b'\r\x03\x03')  # Ctrl+C
+    ser.read_until(REPL_PROMPT)
+    ser.write(b'\x04')  # Ctrl+D
+    ser.read_until(b'soft reboot')
+    ser.write(b'\x03')
+    ser.read_until(REPL_PROMPT)
+    ser.reset_input_buffer()
 
-def scan_ports() -> List[str]:
-    """Scan for available serial ports"""
-    import glob
 
-    ports = []
+def repl_line(code: str) -> bytes:
+    """Build the single REPL input line that runs a block of code
 
-    # Common port patterns
-    patterns = [
-        '/dev/cu.usbserial-*',  # macOS
-        '/dev/cu.wchusbserial-*',  # macOS
-        '/dev/ttyUSB*',  # Linux
-        '/dev/ttyACM*',  # Linux
-    ]
+    The block is passed to exec() on one line, so REPL auto-indent cannot
+    mangle it, followed by the sentinel print.
+    """
+    return f"exec({code!r});print('===','END===',sep='')\r\n".encode()
 
-    for pattern in patterns:
-        ports.extend(glob.glob(pattern))
 
-    return sorted(ports)
+def repl_exec(ser: 'serial.Serial', line: bytes) -> bytes:
+    """Submit a line built by repl_line() and return the block's output
 
+    The output is read up to the sentinel instead of sleeping for a fixed
+    time per command. It is returned as bytes: the markers searched for are
+    ASCII, so only the parts that get printed need decoding.
+    """
+    ser.write(line)
+    data = ser.read_until(REPL_SENTINEL)
+
+    # Drop the echoed input line and the sentinel itself
+    _, _, output = data.partition(b'\r\n')
+    if output.endswith(REPL_SENTINEL):
+        output = output[:-len(REPL_SENTINEL)]
+    return output
+
+
+# The probes are fixed, so their REPL lines are built once at import
+REPL_TEST_LINE = repl_line('print("CYD_TEST_OK")')
+
+HARDWARE_INFO_LINE = repl_line(
+    "import sys, gc, machine\n"
+    "print('Python:', sys.version)\n"
+    "print('Free memory:', gc.mem_free())\n"
+    "print('Frequency:', machine.freq())\n"
+    "try:\n"
+    "  import esp\n"
+    "  print('Flash size:', esp.flash_size())\n"
+    "except: pass\n"
+)
+
+DISPLAY_LIBS = ('ili9341', 'xglcd_font', 'xpt2046')
+
+DISPLAY_LIBS_LINE = repl_line(
+    f"for lib in {DISPLAY_LIBS!r}:\n"
+    "  try:\n"
+    "    __import__(lib)\n"
+    "    print(lib + '_OK')\n"
+    "  except Exception as e:\n"
+    "    print(lib + '_ERROR:', e)\n"
+)
+
+
+# Serial device names in /dev: macOS USB-serial bridges, Linux USB/ACM ports
+PORT_NAME_RE = re.compile(r'^(cu\.usbserial-|cu\.wchusbserial-|ttyUSB|ttyACM)')
+
+
+@lru_cache(maxsize=1)
+def scan_ports() -> Tuple[str, ...]:
+    """Scan for available serial ports (cached, scanned once per run)"""
+    # One pass over /dev instead of a directory read per pattern
+    try:
+        with os.scandir('/dev') as entries:
+            ports = ['/dev/' + entry.name for entry in entries if PORT_NAME_RE.match(entry.name)]
+    except FileNotFoundError:
+        return ()
 
-def test_serial_connection(port: str, baudrate: int = 115200, timeout: float = 2.0) -> bool:
+    return tuple(sorted(ports))
+
+
+def test_serial_connection(port: str, baudrate: int = 115200, timeout: float = 2.0,
+                           out: Optional[TextIO] = None) -> bool:
     """Test basic serial connection to a port"""
+    import serial
+
     try:
-        print_step(f"Testing serial connection to {port}...")
+        print_step(f"Testing serial connection to {port}...", out)
 
         with serial.Serial(port, baudrate, timeout=timeout) as ser:
-            # Send a simple command
+            # Send a simple command, a REPL answers with its prompt
             ser.write(b'\r\n')
-            time.sleep(0.1)
 
             # Try to read response
-            response = ser.read(100)
+            response = ser.read_until(REPL_PROMPT, 100)
 
             if response:
-                print_success(f"Serial connection established")
-                print(f"   Response: {response.decode('utf-8', errors='ignore').strip()}")
+                print_success(f"Serial connection established", out)
+                print(f"   Response: {response.decode('utf-8', errors='ignore').strip()}", file=out)
                 return True
             else:
-                print_warning("No response from device")
+                print_warning("No response from device", out)
                 return False
 
     except serial.SerialException as e:
-        print_error(f"Serial connection failed: {e}")
+        print_error(f"Serial connection failed: {e}", out)
         return False
     except Exception as e:
-        print_error(f"Unexpected error: {e}")
+        print_error(f"Unexpected error: {e}", out)
         return False
 
 
-def test_micropython_repl(port: str) -> bool:
+def test_micropython_repl(port: str, out: Optional[TextIO] = None) -> bool:
     """Test MicroPython REPL functionality"""
+    import serial
+
     try:
-        print_step("Testing MicroPython REPL...")
+        print_step("Testing MicroPython REPL...", out)
 
         with serial.Serial(port, 115200, timeout=3.0) as ser:
-            # Send interrupt to stop any running code
-            ser.write(b'\x03')  # Ctrl+C
-            time.sleep(0.2)
-
-            # Send REPL reset
-            ser.write(b'\x04')  # Ctrl+D
-            time.sleep(0.5)
-
-            # Clear any existing data
-            ser.reset_input_buffer()
+            # Stop any running code and reset the REPL
+            reset_repl(ser)
 
             # Send a simple Python command
-            ser.write(b'print("CYD_TEST_OK")\r\n')
-            time.sleep(0.5)
+            response = repl_exec(ser, REPL_TEST_LINE)
 
-            # Read response
-            response = ser.read(1000).decode('utf-8', errors='ignore')
-
-            if "CYD_TEST_OK" in response:
-                print_success("MicroPython REPL is working")
+            if b"CYD_TEST_OK" in response:
+                print_success("MicroPython REPL is working", out)
                 return True
             else:
-                print_warning("MicroPython REPL not responding correctly")
-                print(f"   Response: {response.strip()}")
+                print_warning("MicroPython REPL not responding correctly", out)
+                print(f"   Response: {response[:200].decode('utf-8', errors='ignore').strip()}", file=out)
                 return False
 
     except Exception as e:
-        print_error(f"REPL test failed: {e}")
+        print_error(f"REPL test failed: {e}", out)
         return False
 
 
-def test_hardware_info(port: str) -> dict:
+def test_hardware_info(port: str, out: Optional[TextIO] = None) -> dict:
     """Get hardware information from the device"""
-    try:
-        print_step("Getting hardware information...")
-
-        commands = [
-            "import sys; print('Python:', sys.version)",
-            "import gc; print('Free memory:', gc.mem_free())",
-            "import machine; print('Frequency:', machine.freq())",
-            "try:\n  import esp\n  print('Flash size:', esp.flash_size())\nexcept: pass",
-        ]
+    import serial
 
-        results = {}
+    try:
+        print_step("Getting hardware information...", out)
 
         with serial.Serial(port, 115200, timeout=3.0) as ser:
             # Reset REPL
-            ser.write(b'\x03\x04')
-            time.sleep(0.5)
-            ser.reset_input_buffer()
-
-            for command in commands:
-                ser.write(command.encode() + b'\r\n')
-                time.sleep(0.5)
+            reset_repl(ser)
 
-                response = ser.read(1000).decode('utf-8', errors='ignore')
-                lines = [line.strip() for line in response.split('\n') if line.strip()]
-
-                for line in lines:
-                    if ':' in line and not line.startswith('>>>'):
-                        key, value = line.split(':', 1)
-                        results[key.strip()] = value.strip()
+            # All probes go to the device as one block
+            response = repl_exec(ser, HARDWARE_INFO_LINE)
+            results = {key.decode(): value.decode('utf-8', errors='ignore')
+                       for key, value in HARDWARE_INFO_RE.findall(response)}
 
         if results:
-            print_success("Hardware information retrieved:")
+            print_success("Hardware information retrieved:", out)
             for key, value in results.items():
-                print(f"   {key}: {value}")
+                print(f"   {key}: {value}", file=out)
         else:
-            print_warning("Could not retrieve hardware information")
+            print_warning("Could not retrieve hardware information", out)
 
         return results
 
     except Exception as e:
-        print_error(f"Hardware info test failed: {e}")
+        print_error(f"Hardware info test failed: {e}", out)
         return {}
 
 
-def test_display_libs(port: str) -> bool:
+def test_display_libs(port: str, out: Optional[TextIO] = None) -> bool:
     """Test if display libraries are available"""
+    import serial
+
     try:
-        print_step("Testing display libraries...")
+        print_step("Testing display libraries...", out)
 
         with serial.Serial(port, 115200, timeout=3.0) as ser:
             # Reset REPL
-            ser.write(b'\x03\x04')
-            time.sleep(0.5)
-            ser.reset_input_buffer()
+            reset_repl(ser)
 
-            # Test each library
-            libs = ['ili9341', 'xglcd_font', 'xpt2046']
+            # Test all libraries in one block
             available_libs = []
+            response = repl_exec(ser, DISPLAY_LIBS_LINE)
 
-            for lib in libs:
-                ser.write(f'try:\n  import {lib}\n  print("{lib}_OK")\nexcept Exception as e:\n  print("{lib}_ERROR:", e)\n'.encode())
-                time.sleep(0.5)
-
-                response = ser.read(1000).decode('utf-8', errors='ignore')
+            # One pass over the output: lib -> (status, error message)
+            status = {m[0].decode(): (m[1], m[2]) for m in LIB_STATUS_RE.findall(response)}
 
-                if f"{lib}_OK" in response:
+            for lib in DISPLAY_LIBS:
+                result, error = status.get(lib, (None, b""))
+                if result == b"OK":
                     available_libs.append(lib)
-                    print_success(f"Library {lib} is available")
+                    print_success(f"Library {lib} is available", out)
                 else:
-                    print_warning(f"Library {lib} is missing")
-                    if f"{lib}_ERROR" in response:
-                        error_line = [line for line in response.split('\n') if f"{lib}_ERROR" in line]
-                        if error_line:
-                            print(f"   Error: {error_line[0].split(':', 1)[1].strip()}")
+                    print_warning(f"Library {lib} is missing", out)
+                    if result == b"ERROR" and error:
+                        print(f"   Error: {error.decode('utf-8', errors='ignore')}", file=out)
 
-            return len(available_libs) == len(libs)
+            return len(available_libs) == len(DISPLAY_LIBS)
 
     except Exception as e:
-        print_error(f"Display library test failed: {e}")
+        print_error(f"Display library test failed: {e}", out)
         return False
 
 
-def test_with_mpremote(port: str) -> bool:
+def test_with_mpremote(port: str, out: Optional[TextIO] = None) -> bool:
     """Test device using mpremote if available"""
+    import subprocess
+
     try:
-        print_step("Testing with mpremote...")
+        print_step("Testing with mpremote...", out)
 
         # Check if mpremote is available
-        result = subprocess.run(['which', 'mpremote'], capture_output=True, text=True)
-        if result.returncode != 0:
-            print_warning("mpremote not found")
+        if MPREMOTE_PATH is None:
+            print_warning("mpremote not found", out)
             return False
 
         # Test mpremote connection
-        cmd = ['mpremote', 'connect', port, 'eval', 'print("MPREMOTE_OK")']
+        cmd = [MPREMOTE_PATH, 'connect', port, 'eval', 'print("MPREMOTE_OK")']
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
 
         if result.returncode == 0 and "MPREMOTE_OK" in result.stdout:
-            print_success("mpremote connection successful")
+            print_success("mpremote connection successful", out)
             return True
         else:
-            print_warning("mpremote connection failed")
+            print_warning("mpremote connection failed", out)
             if result.stderr:
-                print(f"   Error: {result.stderr.strip()}")
+                print(f"   Error: {result.stderr.strip()}", file=out)
             return False
 
     except subprocess.TimeoutExpired:
-        print_warning("mpremote test timed out")
+        print_warning("mpremote test timed out", out)
         return False
     except Exception as e:
-        print_error(f"mpremote test failed: {e}")
+        print_error(f"mpremote test failed: {e}", out)
         return False
 
 
-def run_comprehensive_test(port: str) -> dict:
+def run_comprehensive_test(port: str, out: Optional[TextIO] = None) -> dict:
     """Run comprehensive device test"""
-    print_header(f"COMPREHENSIVE CYD TEST - {port}")
+    print_header(f"COMPREHENSIVE CYD TEST - {port}", out)
 
     results = {
         'port': port,
@@ -279,21 +349,21 @@ def run_comprehensive_test(port: str) -> dict:
     }
 
     # Test serial connection
-    results['serial_connection'] = test_serial_connection(port)
+    results['serial_connection'] = test_serial_connection(port, out=out)
 
     if results['serial_connection']:
         # Test MicroPython REPL
-        results['micropython_repl'] = test_micropython_repl(port)
+        results['micropython_repl'] = test_micropython_repl(port, out=out)
 
         if results['micropython_repl']:
             # Get hardware info
-            results['hardware_info'] = test_hardware_info(port)
+            results['hardware_info'] = test_hardware_info(port, out=out)
 
             # Test display libraries
-            results['display_libs'] = test_display_libs(port)
+            results['display_libs'] = test_display_libs(port, out=out)
 
             # Test mpremote
-            results['mpremote'] = test_with_mpremote(port)
+            results['mpremote'] = test_with_mpremote(port, out=out)
 
     # Determine overall status
     if results['serial_connection'] and results['micropython_repl']:
@@ -307,32 +377,47 @@ def run_comprehensive_test(port: str) -> dict:
     return results
 
 
-def print_test_summary(results: dict) -> None:
+def print_test_summary(results: dict, out: Optional[TextIO] = None) -> None:
     """Print test summary"""
-    print_header("TEST SUMMARY")
+    # Collect the summary and emit it with a single write
+    summary = io.StringIO()
+    print_header("TEST SUMMARY", summary)
 
     status = results['overall_status']
     port = results['port']
 
     if status == 'READY':
-        print_success(f"Device {port} is ready for CYD Stopwatch deployment!")
+        print_success(f"Device {port} is ready for CYD Stopwatch deployment!", summary)
     elif status == 'NEEDS_LIBS':
-        print_warning(f"Device {port} needs display libraries installed")
-        print("   Run the installer to download and deploy libraries")
+        print_warning(f"Device {port} needs display libraries installed", summary)
+        print("   Run the installer to download and deploy libraries", file=summary)
     else:
-        print_error(f"Device {port} is not ready")
-        print("   Check connection and MicroPython installation")
+        print_error(f"Device {port} is not ready", summary)
+        print("   Check connection and MicroPython installation", file=summary)
 
-    print(f"\n{Colors.BLUE}Test Results:{Colors.NC}")
-    print(f"   Serial Connection: {'✓' if results['serial_connection'] else '✗'}")
-    print(f"   MicroPython REPL:  {'✓' if results['micropython_repl'] else '✗'}")
-    print(f"   Display Libraries: {'✓' if results['display_libs'] else '✗'}")
-    print(f"   mpremote Support:  {'✓' if results['mpremote'] else '✗'}")
+    print(f"\n{Colors.BLUE}Test Results:{Colors.NC}", file=summary)
+    print(f"   Serial Connection: {'✓' if results['serial_connection'] else '✗'}", file=summary)
+    print(f"   MicroPython REPL:  {'✓' if results['micropython_repl'] else '✗'}", file=summary)
+    print(f"   Display Libraries: {'✓' if results['display_libs'] else '✗'}", file=summary)
+    print(f"   mpremote Support:  {'✓' if results['mpremote'] else '✗'}", file=summary)
 
     if results['hardware_info']:
-        print(f"\n{Colors.BLUE}Hardware Info:{Colors.NC}")
+        print(f"\n{Colors.BLUE}Hardware Info:{Colors.NC}", file=summary)
         for key, value in results['hardware_info'].items():
-            print(f"   {key}: {value}")
+            print(f"   {key}: {value}", file=summary)
+
+    (out or sys.stdout).write(summary.getvalue())
+
+
+def test_port_report(port: str) -> str:
+    """Test one port and return its complete report as text"""
+    out = io.StringIO()
+    try:
+        results = run_comprehensive_test(port, out=out)
+        print_test_summary(results, out=out)
+    except Exception as e:
+        print_error(f"Test failed for {port}: {e}", out)
+    return out.getvalue()
 
 
 def main():
@@ -358,17 +443,18 @@ def main():
 
         if args.test_all:
             print("\nTesting all ports...")
-            for port in ports:
-                try:
-                    results = run_comprehensive_test(port)
-                    print_test_summary(results)
-                except KeyboardInterrupt:
-                    print_warning("Test interrupted by user")
-                    break
-                except Exception as e:
-                    print_error(f"Test failed for {port}: {e}")
-
-                print()  # Add spacing between tests
+
+            # Every port is an independent device, so test them concurrently
+            # and print each report in one piece as it completes
+            pool = ThreadPoolExecutor(max_workers=min(8, len(ports)))
+            try:
+                futures = [pool.submit(test_port_report, port) for port in ports]
+                for future in as_completed(futures):
+                    print(future.result())  # Trailing newline spaces the reports
+            except KeyboardInterrupt:
+                print_warning("Test interrupted by user")
+            finally:
+                pool.shutdown(cancel_futures=True)
 
     elif args.port:
         try:
@@ -15,35 +15,39 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Mock the machine module for testing
 class MockPin:
+    __slots__ = ('pin', 'mode', '_value')
     OUT = 'OUT'
     def __init__(self, pin, mode=None, value=None):
         self.pin = pin
         self.mode = mode
-        self.value = value or 0
+        self._value = value or 0
 
     def on(self):
-        self.value = 1
+        self._value = 1
 
     def off(self):
-        self.value = 0
+        self._value = 0
 
     def value(self, val=None):
         if val is not None:
-            self.value = val
-        return self.value
+            self._value = val
+        return self._value
 
 class MockADC:
+    __slots__ = ('pin', '_atten')
     ATTN_11DB = 'ATTN_11DB'
-    def __init__(self, pin):
+    def __init__(self, pin, atten=None):
         self.pin = pin
+        self._atten = atten
 
     def atten(self, val):
-        pass
+        self._atten = val
 
     def read(self):
         return 2048  # Mock light sensor reading
 
 class MockSPI:
+    __slots__ = ()
     def __init__(self, *args, **kwargs):
         pass
 
@@ -53,28 +57,42 @@ class MockMachine:
     ADC = MockADC
     SPI = MockSPI
 
+# MicroPython ticks wrap around at 2**30 on the ESP32
+TICKS_PERIOD = 1 << 30
+
+# Bound once: monotonic integer clock (immune to wall-clock changes) and sleep
+_monotonic_ns = time.monotonic_ns
+_sleep = time.sleep
+
 # Mock time module with MicroPython functions
 class MockTime:
+    __slots__ = ()
+
     @staticmethod
     def ticks_ms():
-        return int(time.time() * 1000)
+        return (_monotonic_ns() // 1_000_000) % TICKS_PERIOD
+
+    @staticmethod
+    def ticks_us():
+        return (_monotonic_ns() // 1_000) % TICKS_PERIOD
 
     @staticmethod
     def ticks_diff(end, start):
-        return end - start
+        half = TICKS_PERIOD // 2
+        return ((end - start + half) % TICKS_PERIOD) - half
 
     @staticmethod
     def sleep_ms(ms):
-        time.sleep(ms / 1000.0)
+        _sleep(ms / 1000.0)
 
 # Replace modules
 sys.modules['machine'] = MockMachine()
 original_time = sys.modules['time']
-mock_time = MockTime()
-# Add our mock functions to the time module
-original_time.ticks_ms = mock_time.ticks_ms
-original_time.ticks_diff = mock_time.ticks_diff
-original_time.sleep_ms = mock_time.sleep_ms
+# Add our mock functions to the time module, straight off the class
+original_time.ticks_ms = MockTime.ticks_ms
+original_time.ticks_us = MockTime.ticks_us
+original_time.ticks_diff = MockTime.ticks_diff
+original_time.sleep_ms = MockTime.sleep_ms
 
 # Now we can import our modules
 from stopwatch import Stopwatch
@@ -131,6 +149,15 @@ def test_stopwatch():
 
     print("All stopwatch tests passed! ✅")
 
+def wait_ms(ms):
+    """Wait at least ms milliseconds, sleeping coarsely and spinning the last 1ms"""
+    deadline = time.perf_counter_ns() + ms * 1_000_000
+    coarse = deadline - 1_000_000 - time.perf_counter_ns()
+    if coarse > 0:
+        time.sleep(coarse / 1e9)
+    while time.perf_counter_ns() < deadline:
+        pass
+
 def test_timing_precision():
     """Test timing precision over longer periods"""
     print("\nTesting timing precision...")
@@ -140,19 +167,60 @@ def test_timing_precision():
 
     # Test multiple start/stop cycles
     for i in range(3):
-        time.sleep(0.05)  # 50ms
+        wait_ms(50)
         sw.stop()
-        time.sleep(0.02)  # 20ms pause
+        wait_ms(20)  # 20ms pause
         sw.start()
 
     sw.stop()
     total_time = sw.get_elapsed_time()
-    expected_min = 150 - 30  # 3 * 50ms, allow 30ms variance
-    expected_max = 150 + 30
+    expected_min = 150  # 3 * 50ms, the waits never end early
+    expected_max = 150 + 30  # scheduler jitter can only make waits longer
 
     assert expected_min <= total_time <= expected_max
+    assert sw.get_elapsed_us() // 1000 == total_time
     print(f"✓ Precision test passed: {total_time}ms (expected ~150ms)")
 
+def test_time_components():
+    """Test time component breakdown and formatting"""
+    print("\nTesting time components...")
+
+    sw = Stopwatch()
+    sw.set_elapsed_time(3723456)  # 1h 2m 3s 456ms
+
+    stats = sw.get_session_stats()
+    assert (stats['hours'], stats['minutes'], stats['seconds'], stats['milliseconds']) == (1, 2, 3, 456)
+    assert stats['formatted'] == "01:02:03.456"
+    assert sw.get_time_components()['total_ms'] == 3723456
+    assert sw.get_formatted_time('short') == "01:02:03"
+    assert sw.get_formatted_time('minimal') == "1h 2m"
+
+    # Repeated 'full' calls reuse the cached string until the time changes
+    assert sw.get_formatted_time() is sw.get_formatted_time()
+    sw.set_elapsed_time(3723457)
+    assert sw.get_formatted_time() == "01:02:03.457"
+    print(f"✓ Components test passed: {stats['formatted']}")
+
+def test_ticks_wraparound():
+    """Test timing across a ticks_us() wraparound"""
+    print("\nTesting ticks wraparound...")
+
+    ticks_us = time.ticks_us
+    try:
+        sw = Stopwatch()
+        time.ticks_us = lambda: TICKS_PERIOD - 500
+        sw.start()
+        time.ticks_us = lambda: 2500  # Counter wrapped, 3000us later
+        assert sw.get_elapsed_us() == 3000
+        assert sw.get_elapsed_time() == 3
+        assert sw.lap_time() == 3
+        sw.stop()
+        assert not sw.is_running()
+    finally:
+        time.ticks_us = ticks_us
+
+    print(f"✓ Wraparound test passed: {sw.get_elapsed_us()}us")
+
 def main():
     """Run all tests"""
     print("=" * 50)
@@ -162,6 +230,8 @@ def main():
     try:
         test_stopwatch()
         test_timing_precision()
+        test_time_components()
+        test_ticks_wraparound()
 
         print("\n" + "=" * 50)
         print("ALL TESTS PASSED! ✅")
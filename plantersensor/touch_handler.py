@@ -7,6 +7,8 @@ Based on the CYD pin configuration and touch examples.
 """
 
 from machine import Pin, SPI
+from array import array
+import micropython
 import time
 
 # Import touch driver
@@ -15,13 +17,28 @@ try:
 except ImportError:
     print("Warning: xpt2046 library not found. Make sure to install it in /lib/")
 
+@micropython.viper
+def _close_avg(x1: int, y1: int, x2: int, y2: int) -> int:
+    """Average two samples packed as (x << 16) | y, or -1 if over 20px apart"""
+    dx = x1 - x2
+    dy = y1 - y2
+    if dx < 0:
+        dx = -dx
+    if dy < 0:
+        dy = -dy
+    if dx < 20 and dy < 20:
+        return (((x1 + x2) >> 1) << 16) | ((y1 + y2) >> 1)
+    return -1
+
 class TouchHandler:
     def __init__(self):
         print("Initializing touch handler...")
 
         # CYD Touch pin configuration
         # Touch screen uses different SPI pins than display
-        self.touch_spi = SPI(1, baudrate=1000000, sck=Pin(25), mosi=Pin(32), miso=Pin(39))
+        # The XPT2046 is rated for a 2.5 MHz DCLK in SPI mode 0
+        self.touch_spi = SPI(1, baudrate=2_500_000, polarity=0, phase=0,
+                             sck=Pin(25), mosi=Pin(32), miso=Pin(39))
 
         # Initialize touch handler
         try:
@@ -40,7 +57,9 @@ class TouchHandler:
         # Touch state tracking
         self.last_touch_time = 0
         self.touch_debounce = 200  # 200ms debounce
-        self.last_touch_pos = None
+
+        # Preallocated interrupt touch storage: x, y, valid flag
+        self._touch_buf = array('i', [0, 0, 0])
 
         print("Touch handler initialized!")
 
@@ -50,9 +69,11 @@ class TouchHandler:
 
         # Simple debounce
         if time.ticks_diff(current_time, self.last_touch_time) > self.touch_debounce:
-            self.last_touch_pos = (x, y)
+            buf = self._touch_buf
+            buf[0] = x
+            buf[1] = y
+            buf[2] = 1
             self.last_touch_time = current_time
-            print(f"Touch interrupt: ({x}, {y})")
 
     def get_touch(self):
         """Get touch coordinates if available"""
@@ -66,10 +87,10 @@ class TouchHandler:
                 return touch_data
 
             # Also check if we have a recent interrupt-based touch
-            if self.last_touch_pos:
-                pos = self.last_touch_pos
-                self.last_touch_pos = None  # Clear after reading
-                return pos
+            buf = self._touch_buf
+            if buf[2]:
+                buf[2] = 0  # Clear after reading
+                return (buf[0], buf[1])
 
         except Exception as e:
             print(f"Touch read error: {e}")
@@ -108,7 +129,7 @@ class TouchHandler:
         print("Touch calibration not implemented - using default calibration")
         return True
 
-    def get_stable_touch(self, stability_time=50):
+    def get_stable_touch(self, stability_time=25):
         """Get a stable touch reading by requiring consistent position"""
         first_touch = self.get_touch()
         if not first_touch:
@@ -120,12 +141,11 @@ class TouchHandler:
         # Verify touch is still in similar position
         second_touch = self.get_touch()
         if second_touch:
-            x1, y1 = first_touch
-            x2, y2 = second_touch
-
             # Check if touches are close enough (within 20 pixels)
-            if abs(x1 - x2) < 20 and abs(y1 - y2) < 20:
-                return ((x1 + x2) // 2, (y1 + y2) // 2)  # Return average
+            avg = _close_avg(first_touch[0], first_touch[1],
+                             second_touch[0], second_touch[1])
+            if avg >= 0:
+                return (avg >> 16, avg & 0xFFFF)  # Return average
 
         return None
 
@@ -21,7 +21,9 @@ import sys
 import time
 import serial
 import json
-from typing import Dict, List, Optional, Any
+import re
+from array import array
+from typing import Dict, List, Optional, Any, Tuple
 
 
 class Colors:
@@ -35,31 +37,213 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Raw REPL framing: commands are sent without echo and end with Ctrl-D, the
+# device answers OK<stdout>\x04<stderr>\x04>
+RAW_REPL_BANNER = b'raw REPL; CTRL-B to exit\r\n>'
+RAW_REPL_END = b'\x04>'
+
+# Linux serial_struct ioctls and the flag that makes USB serial drivers pass
+# received bytes on at once instead of batching them (FTDI: 16 ms -> 1 ms)
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 1 << 13
+SERIAL_STRUCT_FLAGS = 4  # index of the flags int in struct serial_struct
+
+
+# Files the deployment must contain, relative to the device's root
+REQUIRED_FILES = (
+    'main.py',
+    'stopwatch.py',
+    'display_manager.py',
+    'touch_handler.py',
+    'config.py',
+    'boot.py',
+    'lib/ili9341.py',
+    'lib/xglcd_font.py',
+    'lib/xpt2046.py'
+)
+
+
+def group_by_directory(paths) -> Dict[str, List[Tuple[str, str]]]:
+    """Group paths by directory as (path, name) pairs"""
+    groups = {}
+    for path in paths:
+        directory, _, name = path.rpartition('/')
+        groups.setdefault(directory or '.', []).append((path, name))
+    return groups
+
+
+FILE_GROUPS = group_by_directory(REQUIRED_FILES)
+
+# Lists every directory holding required files in one command, a missing
+# directory is reported as empty instead of raising. ilistdir() reads each
+# directory once without the per-entry work of listdir(). The names are
+# inserted with repr() so they are always quoted correctly.
+FILE_LISTING_COMMAND = (
+    "import os, json\n"
+    "def _names(d):\n"
+    "    try:\n"
+    "        return [e[0] for e in os.ilistdir(d)]\n"
+    "    except OSError:\n"
+    "        return []\n"
+    f"print('FILES:' + json.dumps({{d: _names(d) for d in {list(FILE_GROUPS)!r}}}))\n"
+)
+FILE_LISTING_RE = re.compile(r'^FILES:(\{.*\})', re.MULTILINE)
+
+# Modules the application imports on the device
+REQUIRED_MODULES = (
+    'stopwatch',
+    'display_manager',
+    'touch_handler',
+    'config',
+    'ili9341',
+    'xglcd_font',
+    'xpt2046'
+)
+
+# Tries every import in one command, printing one status line per module
+IMPORT_TEST_COMMAND = (
+    f"for m in {list(REQUIRED_MODULES)!r}:\n"
+    "  try:\n"
+    "    __import__(m)\n"
+    "    print(m + '_OK')\n"
+    "  except Exception as e:\n"
+    "    print(m + '_ERROR:', str(e))\n"
+)
+IMPORT_STATUS_RE = re.compile(r'^(\w+?)_(OK|ERROR)(?::[ \t]*(.*?))?\r?$', re.MULTILINE)
+# KEY: value lines printed by the functionality and system info scripts
+RESPONSE_RE = re.compile(r'^([A-Z_]+):[ \t]*(.*?)\r?$', re.MULTILINE)
+SYSTEM_INFO_KEYS = frozenset(('FREE_MEMORY_PRE', 'FREE_MEMORY_POST', 'TOTAL_MEMORY',
+                              'PYTHON_VERSION', 'FREQUENCY', 'FLASH_SIZE'))
+
+# Probes for each hardware component, printing COMPONENT_OK or COMPONENT_ERROR
+HARDWARE_TESTS = {
+    'display': """
+try:
+    from ili9341 import Display
+    from machine import Pin, SPI
+    spi = SPI(2, baudrate=40000000, sck=Pin(14), mosi=Pin(13))
+    display = Display(spi, dc=Pin(2), cs=Pin(15), rst=Pin(0))
+    print('DISPLAY_OK')
+except Exception as e:
+    print('DISPLAY_ERROR:', str(e))
+""",
+    'touch': """
+try:
+    from xpt2046 import Touch
+    from machine import Pin, SPI
+    spi = SPI(2, baudrate=40000000, sck=Pin(14), mosi=Pin(13))
+    touch = Touch(spi, cs=Pin(12), int_pin=Pin(21))
+    print('TOUCH_OK')
+except Exception as e:
+    print('TOUCH_ERROR:', str(e))
+""",
+    'rgb_led': """
+try:
+    from machine import Pin, PWM
+    red = PWM(Pin(4))
+    green = PWM(Pin(16))
+    blue = PWM(Pin(17))
+    print('RGB_LED_OK')
+except Exception as e:
+    print('RGB_LED_ERROR:', str(e))
+""",
+    'light_sensor': """
+try:
+    from machine import Pin, ADC
+    light_sensor = ADC(Pin(34))
+    reading = light_sensor.read()
+    print('LIGHT_SENSOR_OK:', reading)
+except Exception as e:
+    print('LIGHT_SENSOR_ERROR:', str(e))
+"""
+}
+HARDWARE_STATUS_RE = re.compile(r'^(DISPLAY|TOUCH|RGB_LED|LIGHT_SENSOR)_(OK|ERROR)(?::[ \t]*(.*?))?\r?$',
+                                re.MULTILINE)
+
+# Times a short stopwatch run and a reset
+STOPWATCH_TEST_SCRIPT = """
+try:
+    from stopwatch import Stopwatch
+    sw = Stopwatch()
+
+    # Test basic operations
+    sw.start()
+    import time
+    time.sleep_ms(100)  # Wait 100ms
+    elapsed = sw.get_elapsed_time()
+    sw.stop()
+
+    print('STOPWATCH_OK:', elapsed)
+
+    # Test reset
+    sw.reset()
+    elapsed_after_reset = sw.get_elapsed_time()
+    print('RESET_OK:', elapsed_after_reset)
+
+except Exception as e:
+    print('STOPWATCH_ERROR:', str(e))
+"""
+
+# Reports memory and system details
+SYSTEM_INFO_SCRIPT = """
+import gc, sys
+import machine
+pre = gc.mem_free()
+gc.collect()
+post = gc.mem_free()
+print('FREE_MEMORY_PRE:', pre)
+print('FREE_MEMORY_POST:', post)
+print('TOTAL_MEMORY:', gc.mem_alloc() + post)
+print('PYTHON_VERSION:', sys.version)
+print('FREQUENCY:', machine.freq())
+try:
+    import esp
+    print('FLASH_SIZE:', esp.flash_size())
+except:
+    pass
+"""
+
+# Every phase in one script, so a full verification is a single raw REPL
+# transaction. The phases print distinct markers and guard their own errors;
+# the final marker shows the script ran to the end.
+VERIFY_DONE = 'VERIFY_DONE'
+VERIFY_SCRIPT = "\n".join((FILE_LISTING_COMMAND, IMPORT_TEST_COMMAND, *HARDWARE_TESTS.values(),
+                           STOPWATCH_TEST_SCRIPT, SYSTEM_INFO_SCRIPT, f"print({VERIFY_DONE!r})\n"))
+
+
+# Color envelopes of the print helpers, built once
+_HEADER_RULE = f"{Colors.PURPLE}{'=' * 60}{Colors.NC}\n"
+_STEP_PREFIX = f"{Colors.CYAN}➤ "
+_SUCCESS_PREFIX = f"{Colors.GREEN}✓ "
+_WARNING_PREFIX = f"{Colors.YELLOW}⚠ "
+_ERROR_PREFIX = f"{Colors.RED}✗ "
+_SUFFIX = f"{Colors.NC}\n"
+
+
 def print_header(text: str) -> None:
     """Print a formatted header"""
-    print(f"\n{Colors.PURPLE}{'=' * 60}{Colors.NC}")
-    print(f"{Colors.PURPLE} {text}{Colors.NC}")
-    print(f"{Colors.PURPLE}{'=' * 60}{Colors.NC}\n")
+    sys.stdout.write(f"\n{_HEADER_RULE}{Colors.PURPLE} {text}{_SUFFIX}{_HEADER_RULE}\n")
 
 
 def print_step(text: str) -> None:
     """Print a step message"""
-    print(f"{Colors.CYAN}➤ {text}{Colors.NC}")
+    sys.stdout.write(_STEP_PREFIX + text + _SUFFIX)
 
 
 def print_success(text: str) -> None:
     """Print a success message"""
-    print(f"{Colors.GREEN}✓ {text}{Colors.NC}")
+    sys.stdout.write(_SUCCESS_PREFIX + text + _SUFFIX)
 
 
 def print_warning(text: str) -> None:
     """Print a warning message"""
-    print(f"{Colors.YELLOW}⚠ {text}{Colors.NC}")
+    sys.stdout.write(_WARNING_PREFIX + text + _SUFFIX)
 
 
 def print_error(text: str) -> None:
     """Print an error message"""
-    print(f"{Colors.RED}✗ {text}{Colors.NC}")
+    sys.stdout.write(_ERROR_PREFIX + text + _SUFFIX)
 
 
 class CYDVerifier:
@@ -76,11 +260,9 @@ class CYDVerifier:
         try:
             print_step(f"Connecting to device on {self.port}...")
             self.serial = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
+            self.set_low_latency()
 
-            # Reset REPL
-            self.serial.write(b'\x03\x04')  # Ctrl+C, Ctrl+D
-            time.sleep(1.0)
-            self.serial.reset_input_buffer()
+            self.enter_raw_repl()
 
             print_success("Connected to device")
             return True
@@ -89,277 +271,223 @@ class CYDVerifier:
             print_error(f"Connection failed: {e}")
             return False
 
+    def set_low_latency(self) -> bool:
+        """Ask the Linux serial driver for low latency mode, if it has one"""
+        if not sys.platform.startswith('linux'):
+            return False
+
+        try:
+            import fcntl
+            # Larger than struct serial_struct on every architecture
+            info = array('i', [0] * 32)
+            fcntl.ioctl(self.serial.fd, TIOCGSERIAL, info)
+            info[SERIAL_STRUCT_FLAGS] |= ASYNC_LOW_LATENCY
+            fcntl.ioctl(self.serial.fd, TIOCSSERIAL, info)
+            return True
+        except (ImportError, AttributeError, OSError):
+            # Not every driver supports it (e.g. CDC-ACM), reads still work
+            return False
+
+    def enter_raw_repl(self) -> None:
+        """Interrupt the running program, soft reset and enter the raw REPL"""
+        self.serial.write(b'\r\x03\x03')  # Ctrl+C twice
+        time.sleep(0.1)
+        self.serial.reset_input_buffer()
+
+        self.serial.write(b'\r\x01')  # Ctrl+A
+        if not self.serial.read_until(RAW_REPL_BANNER).endswith(RAW_REPL_BANNER):
+            raise Exception("Could not enter raw REPL")
+
+        # A soft reset from the raw REPL clears state without running main.py
+        self.serial.write(b'\x04')  # Ctrl+D
+        if not self.serial.read_until(RAW_REPL_BANNER).endswith(RAW_REPL_BANNER):
+            raise Exception("No raw REPL after soft reset")
+
+    def exit_raw_repl(self) -> None:
+        """Return the device to the normal REPL"""
+        self.serial.write(b'\r\x02')  # Ctrl+B
+
     def disconnect(self) -> None:
         """Disconnect from the device"""
         if self.serial and self.serial.is_open:
-            self.serial.close()
+            try:
+                self.exit_raw_repl()
+            finally:
+                self.serial.close()
 
     def execute_command(self, command: str, wait_time: float = 0.5) -> str:
-        """Execute a command and return the response"""
+        """Execute a command and return the response
+
+        The command runs in the raw REPL, so the response holds only its
+        output (stderr appended) without the echoed input. wait_time bounds
+        how long to wait for the command to finish.
+        """
         if not self.serial or not self.serial.is_open:
             raise Exception("Device not connected")
 
         # Clear input buffer
         self.serial.reset_input_buffer()
 
-        # Send command
-        self.serial.write(command.encode() + b'\r\n')
-        time.sleep(wait_time)
+        # Send command, Ctrl+D executes it
+        self.serial.write(command.encode() + b'\x04')
+
+        # Read response up to the closing prompt, or whatever arrived by the deadline
+        self.serial.timeout = wait_time
+        try:
+            response = self.serial.read_until(RAW_REPL_END)
+        finally:
+            self.serial.timeout = self.timeout
+
+        if response.startswith(b'OK'):
+            response = response[2:]
+        if response.endswith(RAW_REPL_END):
+            response = response[:-len(RAW_REPL_END)]
+        output, _, error = response.partition(b'\x04')
+        return (output + error).decode('utf-8', errors='ignore')
 
-        # Read response
-        response = self.serial.read(2000).decode('utf-8', errors='ignore')
-        return response
+    def check_required_files(self, response: Optional[str] = None) -> Dict[str, bool]:
+        """Check if all required files are present
 
-    def check_required_files(self) -> Dict[str, bool]:
-        """Check if all required files are present"""
+        response is the output of VERIFY_SCRIPT, the phase's own command is
+        run when it is not given.
+        """
         print_step("Checking required files...")
 
-        required_files = [
-            'main.py',
-            'stopwatch.py',
-            'display_manager.py',
-            'touch_handler.py',
-            'config.py',
-            'boot.py',
-            'lib/ili9341.py',
-            'lib/xglcd_font.py',
-            'lib/xpt2046.py'
-        ]
+        # List the directories once and look each file up locally
+        try:
+            if response is None:
+                response = self.execute_command(FILE_LISTING_COMMAND, wait_time=1.0)
+            match = FILE_LISTING_RE.search(response)
+            if not match:
+                raise Exception("no directory listing in response")
+            listing = {d: set(names) for d, names in json.loads(match.group(1)).items()}
+        except Exception as e:
+            print_error(f"Error listing files: {e}")
+            return dict.fromkeys(REQUIRED_FILES, False)
 
         results = {}
 
-        for file in required_files:
-            try:
-                command = f"import os; print('{file}' if '{file}' in os.listdir('{file.split('/')[0] if '/' in file else '.'}') else 'MISSING')"
-                response = self.execute_command(command)
-
-                if file in response and 'MISSING' not in response:
-                    results[file] = True
+        for directory, files in FILE_GROUPS.items():
+            names = listing.get(directory, ())
+            for file, name in files:
+                results[file] = name in names
+                if results[file]:
                     print_success(f"Found {file}")
                 else:
-                    results[file] = False
                     print_error(f"Missing {file}")
 
-            except Exception as e:
-                results[file] = False
-                print_error(f"Error checking {file}: {e}")
-
         return results
 
-    def test_imports(self) -> Dict[str, bool]:
-        """Test if all modules can be imported"""
-        print_step("Testing module imports...")
+    def test_imports(self, response: Optional[str] = None) -> Dict[str, bool]:
+        """Test if all modules can be imported
 
-        modules = [
-            'stopwatch',
-            'display_manager',
-            'touch_handler',
-            'config',
-            'ili9341',
-            'xglcd_font',
-            'xpt2046'
-        ]
+        response is the output of VERIFY_SCRIPT, the phase's own command is
+        run when it is not given.
+        """
+        print_step("Testing module imports...")
 
-        results = {}
+        try:
+            if response is None:
+                response = self.execute_command(IMPORT_TEST_COMMAND, wait_time=2.0)
+        except Exception as e:
+            print_error(f"Error testing imports: {e}")
+            return dict.fromkeys(REQUIRED_MODULES, False)
 
-        for module in modules:
-            try:
-                command = f"try:\n  import {module}\n  print('{module}_OK')\nexcept Exception as e:\n  print('{module}_ERROR:', str(e))"
-                response = self.execute_command(command, wait_time=1.0)
+        # Collect every module's status line in one pass
+        status = {m[0]: (m[1], m[2]) for m in IMPORT_STATUS_RE.findall(response)}
 
-                if f"{module}_OK" in response:
-                    results[module] = True
-                    print_success(f"Module {module} imported successfully")
-                else:
-                    results[module] = False
-                    error_info = ""
-                    if f"{module}_ERROR" in response:
-                        lines = response.split('\n')
-                        error_lines = [line for line in lines if f"{module}_ERROR" in line]
-                        if error_lines:
-                            error_info = error_lines[0].split(':', 1)[1].strip()
-
-                    print_error(f"Module {module} failed to import")
-                    if error_info:
-                        print(f"   Error: {error_info}")
+        results = {}
 
-            except Exception as e:
-                results[module] = False
-                print_error(f"Error testing {module}: {e}")
+        for module in REQUIRED_MODULES:
+            result, error_info = status.get(module, (None, ""))
+            results[module] = result == 'OK'
+            if results[module]:
+                print_success(f"Module {module} imported successfully")
+            else:
+                print_error(f"Module {module} failed to import")
+                if error_info:
+                    print(f"   Error: {error_info}")
 
         return results
 
-    def test_hardware_components(self) -> Dict[str, bool]:
-        """Test hardware components"""
+    def test_hardware_components(self, response: Optional[str] = None) -> Dict[str, bool]:
+        """Test hardware components
+
+        response is the output of VERIFY_SCRIPT, the phase's own command is
+        run when it is not given.
+        """
         print_step("Testing hardware components...")
 
-        tests = {
-            'display': """
-try:
-    from ili9341 import Display
-    from machine import Pin, SPI
-    spi = SPI(2, baudrate=40000000, sck=Pin(14), mosi=Pin(13))
-    display = Display(spi, dc=Pin(2), cs=Pin(15), rst=Pin(0))
-    print('DISPLAY_OK')
-except Exception as e:
-    print('DISPLAY_ERROR:', str(e))
-""",
-            'touch': """
-try:
-    from xpt2046 import Touch
-    from machine import Pin, SPI
-    spi = SPI(2, baudrate=40000000, sck=Pin(14), mosi=Pin(13))
-    touch = Touch(spi, cs=Pin(12), int_pin=Pin(21))
-    print('TOUCH_OK')
-except Exception as e:
-    print('TOUCH_ERROR:', str(e))
-""",
-            'rgb_led': """
-try:
-    from machine import Pin, PWM
-    red = PWM(Pin(4))
-    green = PWM(Pin(16))
-    blue = PWM(Pin(17))
-    print('RGB_LED_OK')
-except Exception as e:
-    print('RGB_LED_ERROR:', str(e))
-""",
-            'light_sensor': """
-try:
-    from machine import Pin, ADC
-    light_sensor = ADC(Pin(34))
-    reading = light_sensor.read()
-    print('LIGHT_SENSOR_OK:', reading)
-except Exception as e:
-    print('LIGHT_SENSOR_ERROR:', str(e))
-"""
-        }
+        # Run all probes in one script, each one guards its own errors
+        try:
+            if response is None:
+                response = self.execute_command("\n".join(HARDWARE_TESTS.values()), wait_time=3.0)
+        except Exception as e:
+            print_error(f"Error testing hardware: {e}")
+            return dict.fromkeys(HARDWARE_TESTS, False)
+
+        status = {m[0]: (m[1], m[2]) for m in HARDWARE_STATUS_RE.findall(response)}
 
         results = {}
 
-        for component, test_code in tests.items():
-            try:
-                response = self.execute_command(test_code, wait_time=2.0)
-
-                if f"{component.upper()}_OK" in response:
-                    results[component] = True
-                    print_success(f"Hardware component {component} is working")
-
-                    # Extract additional info for light sensor
-                    if component == 'light_sensor' and 'LIGHT_SENSOR_OK:' in response:
-                        lines = response.split('\n')
-                        for line in lines:
-                            if 'LIGHT_SENSOR_OK:' in line:
-                                reading = line.split(':')[1].strip()
-                                print(f"   Light sensor reading: {reading}")
-                                break
-                else:
-                    results[component] = False
-                    print_error(f"Hardware component {component} failed")
-
-                    # Extract error info
-                    error_key = f"{component.upper()}_ERROR"
-                    if error_key in response:
-                        lines = response.split('\n')
-                        error_lines = [line for line in lines if error_key in line]
-                        if error_lines:
-                            error_info = error_lines[0].split(':', 1)[1].strip()
-                            print(f"   Error: {error_info}")
+        for component in HARDWARE_TESTS:
+            result, info = status.get(component.upper(), (None, ""))
+            results[component] = result == 'OK'
+            if results[component]:
+                print_success(f"Hardware component {component} is working")
 
-            except Exception as e:
-                results[component] = False
-                print_error(f"Error testing {component}: {e}")
+                # Additional info for light sensor
+                if component == 'light_sensor' and info:
+                    print(f"   Light sensor reading: {info}")
+            else:
+                print_error(f"Hardware component {component} failed")
+                if info:
+                    print(f"   Error: {info}")
 
         return results
 
-    def test_stopwatch_functionality(self) -> bool:
-        """Test basic stopwatch functionality"""
+    def test_stopwatch_functionality(self, response: Optional[str] = None) -> bool:
+        """Test basic stopwatch functionality
+
+        response is the output of VERIFY_SCRIPT, the phase's own command is
+        run when it is not given.
+        """
         print_step("Testing stopwatch functionality...")
 
         try:
-            # Import and create stopwatch
-            test_code = """
-try:
-    from stopwatch import Stopwatch
-    sw = Stopwatch()
-
-    # Test basic operations
-    sw.start()
-    import time
-    time.sleep_ms(100)  # Wait 100ms
-    elapsed = sw.get_elapsed_time()
-    sw.stop()
-
-    print('STOPWATCH_OK:', elapsed)
-
-    # Test reset
-    sw.reset()
-    elapsed_after_reset = sw.get_elapsed_time()
-    print('RESET_OK:', elapsed_after_reset)
+            if response is None:
+                response = self.execute_command(STOPWATCH_TEST_SCRIPT, wait_time=2.0)
+            fields = dict(RESPONSE_RE.findall(response))
 
-except Exception as e:
-    print('STOPWATCH_ERROR:', str(e))
-"""
-
-            response = self.execute_command(test_code, wait_time=2.0)
-
-            if 'STOPWATCH_OK:' in response and 'RESET_OK:' in response:
+            if 'STOPWATCH_OK' in fields and 'RESET_OK' in fields:
                 print_success("Stopwatch functionality is working")
-
-                # Extract timing info
-                lines = response.split('\n')
-                for line in lines:
-                    if 'STOPWATCH_OK:' in line:
-                        elapsed = line.split(':')[1].strip()
-                        print(f"   Elapsed time test: {elapsed}")
-                    elif 'RESET_OK:' in line:
-                        reset_time = line.split(':')[1].strip()
-                        print(f"   Reset test: {reset_time}")
-
+                print(f"   Elapsed time test: {fields['STOPWATCH_OK']}")
+                print(f"   Reset test: {fields['RESET_OK']}")
                 return True
             else:
                 print_error("Stopwatch functionality failed")
-                if 'STOPWATCH_ERROR:' in response:
-                    lines = response.split('\n')
-                    error_lines = [line for line in lines if 'STOPWATCH_ERROR:' in line]
-                    if error_lines:
-                        error_info = error_lines[0].split(':', 1)[1].strip()
-                        print(f"   Error: {error_info}")
+                if fields.get('STOPWATCH_ERROR'):
+                    print(f"   Error: {fields['STOPWATCH_ERROR']}")
                 return False
 
         except Exception as e:
             print_error(f"Error testing stopwatch: {e}")
             return False
 
-    def get_memory_info(self) -> Dict[str, Any]:
-        """Get memory and system information"""
+    def get_memory_info(self, response: Optional[str] = None) -> Dict[str, Any]:
+        """Get memory and system information
+
+        response is the output of VERIFY_SCRIPT, the phase's own command is
+        run when it is not given.
+        """
         print_step("Getting system information...")
 
         try:
-            command = """
-import gc, sys
-import machine
-gc.collect()
-print('FREE_MEMORY:', gc.mem_free())
-print('TOTAL_MEMORY:', gc.mem_alloc() + gc.mem_free())
-print('PYTHON_VERSION:', sys.version)
-print('FREQUENCY:', machine.freq())
-try:
-    import esp
-    print('FLASH_SIZE:', esp.flash_size())
-except:
-    pass
-"""
-
-            response = self.execute_command(command, wait_time=1.0)
-
-            info = {}
-            lines = response.split('\n')
+            if response is None:
+                response = self.execute_command(SYSTEM_INFO_SCRIPT, wait_time=1.0)
 
-            for line in lines:
-                if ':' in line and any(key in line for key in ['FREE_MEMORY', 'TOTAL_MEMORY', 'PYTHON_VERSION', 'FREQUENCY', 'FLASH_SIZE']):
-                    key, value = line.split(':', 1)
-                    info[key.strip()] = value.strip()
+            info = {key: value for key, value in RESPONSE_RE.findall(response)
+                    if key in SYSTEM_INFO_KEYS}
 
             if info:
                 print_success("System information retrieved:")
@@ -392,20 +520,35 @@ except:
                 'system_info': {}
             }
 
+            # Run every phase on the device at once, the phases below only
+            # parse the combined output. If that fails they run one by one.
+            print_step("Running verification script on device...")
+            try:
+                response = self.execute_command(VERIFY_SCRIPT, wait_time=10.0)
+                # A timeout or an error outside the phases' own handlers still
+                # returns text, so check the script actually completed
+                if 'Traceback' in response:
+                    raise Exception("device raised an error")
+                if not FILE_LISTING_RE.search(response) or VERIFY_DONE not in response:
+                    raise Exception("incomplete response")
+            except Exception as e:
+                print_warning(f"Verification script failed, running phases separately: {e}")
+                response = None
+
             # Check files
-            results['files'] = self.check_required_files()
+            results['files'] = self.check_required_files(response)
 
             # Test imports
-            results['imports'] = self.test_imports()
+            results['imports'] = self.test_imports(response)
 
             # Test hardware
-            results['hardware'] = self.test_hardware_components()
+            results['hardware'] = self.test_hardware_components(response)
 
             # Test stopwatch functionality
-            results['stopwatch'] = self.test_stopwatch_functionality()
+            results['stopwatch'] = self.test_stopwatch_functionality(response)
 
             # Get system info
-            results['system_info'] = self.get_memory_info()
+            results['system_info'] = self.get_memory_info(response)
 
             # Determine overall status
             files_ok = all(results['files'].values())
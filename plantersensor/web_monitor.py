@@ -12,7 +12,8 @@ Note: This requires WiFi configuration and will use additional memory.
 try:
     import network
     import socket
-    import json
+    import select
+    import ujson as json
     import time
     from machine import unique_id
     import ubinascii
@@ -20,79 +21,9 @@ except ImportError:
     # Stub for development
     pass
 
-class WebMonitor:
-    def __init__(self, stopwatch_app, ssid=None, password=None):
-        self.app = stopwatch_app
-        self.ssid = ssid
-        self.password = password
-        self.socket = None
-        self.connected = False
-        self.server_running = False
-
-    def connect_wifi(self, ssid=None, password=None):
-        """Connect to WiFi network"""
-        if ssid:
-            self.ssid = ssid
-        if password:
-            self.password = password
-
-        if not self.ssid or not self.password:
-            print("WiFi credentials not provided")
-            return False
-
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-
-        if wlan.isconnected():
-            print(f"Already connected to WiFi: {wlan.ifconfig()[0]}")
-            self.connected = True
-            return True
-
-        print(f"Connecting to WiFi: {self.ssid}")
-        wlan.connect(self.ssid, self.password)
-
-        # Wait for connection
-        timeout = 10
-        while timeout > 0 and not wlan.isconnected():
-            time.sleep(1)
-            timeout -= 1
-            print(".", end="")
-
-        if wlan.isconnected():
-            ip = wlan.ifconfig()[0]
-            print(f"\nConnected! IP: {ip}")
-            self.connected = True
-            return True
-        else:
-            print("\nFailed to connect to WiFi")
-            return False
-
-    def start_server(self, port=80):
-        """Start web server"""
-        if not self.connected:
-            print("Not connected to WiFi")
-            return False
-
-        try:
-            self.socket = socket.socket()
-            self.socket.bind(('', port))
-            self.socket.listen(1)
-            self.server_running = True
-
-            wlan = network.WLAN(network.STA_IF)
-            ip = wlan.ifconfig()[0]
-            print(f"Web server started at http://{ip}:{port}")
-            return True
-
-        except Exception as e:
-            print(f"Failed to start server: {e}")
-            return False
-
-    def generate_html(self):
-        """Generate HTML page for stopwatch status"""
-        stats = self.app.stopwatch.get_session_stats()
-
-        html = f"""
+# The page is static apart from the values in _HTML_BODY, so the parts
+# around it are encoded once at import instead of on every request
+_HTML_PREFIX = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -100,29 +31,29 @@ class WebMonitor:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             margin: 0;
             padding: 20px;
             min-height: 100vh;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 800px;
             margin: 0 auto;
             background: rgba(255,255,255,0.1);
             padding: 30px;
             border-radius: 15px;
             backdrop-filter: blur(10px);
-        }}
-        .title {{
+        }
+        .title {
             text-align: center;
             font-size: 2.5em;
             margin-bottom: 30px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        }}
-        .time-display {{
+        }
+        .time-display {
             font-size: 4em;
             text-align: center;
             font-family: 'Courier New', monospace;
@@ -131,86 +62,106 @@ class WebMonitor:
             border-radius: 10px;
             margin: 20px 0;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.8);
-        }}
-        .status {{
+        }
+        .status {
             text-align: center;
             font-size: 1.5em;
             margin: 20px 0;
-        }}
-        .status.running {{ color: #4CAF50; }}
-        .status.stopped {{ color: #f44336; }}
-        .status.ready {{ color: #2196F3; }}
-        .stats {{
+        }
+        .status.running { color: #4CAF50; }
+        .status.stopped { color: #f44336; }
+        .status.ready { color: #2196F3; }
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .stat-box {{
+        }
+        .stat-box {
             background: rgba(255,255,255,0.1);
             padding: 20px;
             border-radius: 10px;
             text-align: center;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 0.9em;
             opacity: 0.8;
             margin-bottom: 5px;
-        }}
-        .stat-value {{
+        }
+        .stat-value {
             font-size: 1.5em;
             font-weight: bold;
-        }}
-        .refresh {{
+        }
+        .refresh {
             text-align: center;
             margin: 20px 0;
-        }}
-        .refresh a {{
+        }
+        .refresh a {
             color: white;
             text-decoration: none;
             background: rgba(255,255,255,0.2);
             padding: 10px 20px;
             border-radius: 5px;
             display: inline-block;
-        }}
-        .device-info {{
+        }
+        .device-info {
             text-align: center;
             font-size: 0.8em;
             opacity: 0.7;
             margin-top: 30px;
-        }}
+        }
     </style>
     <script>
-        // Auto-refresh every 5 seconds
-        setTimeout(() => location.reload(), 5000);
+        // Update the values from the JSON API every second instead of
+        // reloading the whole page
+        const labels = {running: '🟢 RUNNING', ready: '🔵 READY', stopped: '🔴 STOPPED'};
+        const show = (id, value) => document.getElementById(id).textContent = value;
+        setInterval(async () => {
+            try {
+                const s = await (await fetch('/api')).json();
+                const state = s.is_running ? 'running' : s.total_ms == 0 ? 'ready' : 'stopped';
+                document.getElementById('status').className = 'status ' + state;
+                show('status', labels[state]);
+                show('time', s.formatted);
+                show('total-ms', s.total_ms.toLocaleString());
+                show('hours', s.hours);
+                show('minutes', s.minutes);
+                show('seconds', s.seconds);
+                show('updated', new Date().toLocaleTimeString());
+            } catch (e) {
+                // Keep the last values until the device answers again
+            }
+        }, 1000);
     </script>
 </head>
 <body>
     <div class="container">
         <h1 class="title">🎯 CYD Stopwatch Monitor</h1>
 
-        <div class="time-display">{stats['formatted']}</div>
+""".encode()
+
+_HTML_BODY = """        <div class="time-display" id="time">{formatted}</div>
 
-        <div class="status {'running' if stats['is_running'] else 'ready' if stats['total_ms'] == 0 else 'stopped'}">
-            {'🟢 RUNNING' if stats['is_running'] else '🔵 READY' if stats['total_ms'] == 0 else '🔴 STOPPED'}
+        <div class="status {status}" id="status">
+            {label}
         </div>
 
         <div class="stats">
             <div class="stat-box">
                 <div class="stat-label">Total Milliseconds</div>
-                <div class="stat-value">{stats['total_ms']:,}</div>
+                <div class="stat-value" id="total-ms">{total_ms:,}</div>
             </div>
             <div class="stat-box">
                 <div class="stat-label">Hours</div>
-                <div class="stat-value">{stats['hours']}</div>
+                <div class="stat-value" id="hours">{hours}</div>
             </div>
             <div class="stat-box">
                 <div class="stat-label">Minutes</div>
-                <div class="stat-value">{stats['minutes']}</div>
+                <div class="stat-value" id="minutes">{minutes}</div>
             </div>
             <div class="stat-box">
                 <div class="stat-label">Seconds</div>
-                <div class="stat-value">{stats['seconds']}</div>
+                <div class="stat-value" id="seconds">{seconds}</div>
             </div>
         </div>
 
@@ -221,41 +172,226 @@ class WebMonitor:
 
         <div class="device-info">
             CYD Stopwatch Device<br>
-            Last updated: {time.time()}<br>
-            Auto-refresh in 5 seconds
+            Last updated: <span id="updated">{updated}</span><br>
+"""
+
+_HTML_SUFFIX = """            Live updates every second
         </div>
     </div>
 </body>
 </html>
-"""
-        return html
+""".encode()
+
+# Status class and label shown for each stopwatch state
+_STATUS_LABELS = {
+    'running': '🟢 RUNNING',
+    'ready': '🔵 READY',
+    'stopped': '🔴 STOPPED',
+}
+
+# wlan.status() values after which waiting longer will not connect
+_WIFI_FAILED = ('STAT_WRONG_PASSWORD', 'STAT_NO_AP_FOUND', 'STAT_ASSOC_FAIL',
+                'STAT_HANDSHAKE_TIMEOUT', 'STAT_CONNECT_FAIL')
+
+# TCP_NODELAY option number, not exported by every port's socket module
+_TCP_NODELAY = 0x01
+
+# How long an encoded /api body is reused before the stats are read again
+_API_CACHE_MS = 100
+
+# Response headers, sent ahead of the body instead of joined to it
+_HTML_HEADER = (b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+_JSON_HEADER = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nConnection: close\r\nContent-Length: "
+_NOT_FOUND = b"HTTP/1.1 404 Not Found\r\nConnection: close\r\n\r\n404 Not Found"
+
+class WebMonitor:
+    def __init__(self, stopwatch_app, ssid=None, password=None):
+        self.app = stopwatch_app
+        self.ssid = ssid
+        self.password = password
+        self.socket = None
+        self.connected = False
+        self.server_running = False
+        self._poller = None
+        self._api_body = None
+        self._api_time = 0
+
+    def connect_wifi(self, ssid=None, password=None):
+        """Connect to WiFi network"""
+        if ssid:
+            self.ssid = ssid
+        if password:
+            self.password = password
+
+        if not self.ssid or not self.password:
+            print("WiFi credentials not provided")
+            return False
+
+        wlan = network.WLAN(network.STA_IF)
+        wlan.active(True)
+
+        if wlan.isconnected():
+            print(f"Already connected to WiFi: {wlan.ifconfig()[0]}")
+            self.connected = True
+            return True
+
+        print(f"Connecting to WiFi: {self.ssid}")
+        wlan.connect(self.ssid, self.password)
+
+        # Wait up to 10 s for an address, checking every 100 ms and giving
+        # up early when the association has already failed
+        # The failure codes differ between ports, use the ones this one has
+        failed = tuple(getattr(network, name) for name in _WIFI_FAILED
+                       if hasattr(network, name))
+        for i in range(100):
+            if wlan.isconnected() or wlan.status() in failed:
+                break
+            time.sleep_ms(100)
+            if i % 10 == 9:
+                print(".", end="")
+
+        if wlan.isconnected():
+            ip = wlan.ifconfig()[0]
+            print(f"\nConnected! IP: {ip}")
+            self.connected = True
+            return True
+        else:
+            print("\nFailed to connect to WiFi")
+            return False
+
+    def start_server(self, port=80):
+        """Start web server"""
+        if not self.connected:
+            print("Not connected to WiFi")
+            return False
+
+        try:
+            self.socket = socket.socket()
+            # Rebind right after a restart instead of waiting out TIME_WAIT,
+            # the server still works without it
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            except Exception as e:
+                print(f"SO_REUSEADDR not set: {e}")
+            self.socket.bind(('', port))
+            # Queue a few connections so page and API requests are not dropped
+            self.socket.listen(5)
+
+            # Poll the listening socket from tick() instead of blocking in accept()
+            self.socket.setblocking(False)
+            self._poller = select.poll()
+            self._poller.register(self.socket, select.POLLIN)
+            self.server_running = True
+
+            wlan = network.WLAN(network.STA_IF)
+            ip = wlan.ifconfig()[0]
+            print(f"Web server started at http://{ip}:{port}")
+            return True
+
+        except Exception as e:
+            print(f"Failed to start server: {e}")
+            return False
+
+    def generate_html(self):
+        """Generate the changing part of the status page
+
+        Returns the bytes sent between _HTML_PREFIX and _HTML_SUFFIX.
+        """
+        stats = self.app.stopwatch.get_session_stats()
+
+        if stats['is_running']:
+            status = 'running'
+        elif stats['total_ms'] == 0:
+            status = 'ready'
+        else:
+            status = 'stopped'
+
+        return _HTML_BODY.format(
+            formatted=stats['formatted'],
+            status=status,
+            label=_STATUS_LABELS[status],
+            total_ms=stats['total_ms'],
+            hours=stats['hours'],
+            minutes=stats['minutes'],
+            seconds=stats['seconds'],
+            updated=time.time(),
+        ).encode()
+
+    def api_body(self):
+        """Return the encoded /api stats, reused for _API_CACHE_MS"""
+        now = time.ticks_ms()
+        if self._api_body is None or time.ticks_diff(now, self._api_time) > _API_CACHE_MS:
+            self._api_body = json.dumps(self.app.stopwatch.get_session_stats()).encode()
+            self._api_time = now
+        return self._api_body
 
     def handle_request(self, conn):
         """Handle incoming HTTP request"""
         try:
-            request = conn.recv(1024).decode()
-
-            # Parse request
-            if 'GET /' in request:
-                if '/api' in request:
-                    # JSON API response
-                    stats = self.app.stopwatch.get_session_stats()
-                    response_data = json.dumps(stats)
-                    response = f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{response_data}"
+            # Read only up to the end of the request line, it may arrive in
+            # several segments
+            request = b''
+            while b'\r\n' not in request:
+                chunk = conn.recv(64)
+                if not chunk:
+                    break
+                request += chunk
+
+            # Discard the rest of the headers unless they were already read
+            if b'\r\n\r\n' not in request:
+                try:
+                    conn.recv(1024)
+                except OSError:
+                    pass
+
+            # Route on the request line bytes, no decoding needed
+            if request.startswith(b'GET /'):
+                if request.startswith(b'GET /api'):
+                    # JSON API response, the length lets clients finish without waiting for close
+                    body = self.api_body()
+                    conn.send(_JSON_HEADER)
+                    conn.send(b"%d\r\n\r\n" % len(body))
+                    conn.send(body)
                 else:
-                    # HTML response
-                    html = self.generate_html()
-                    response = f"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n\r\n{html}"
+                    # HTML response, sent in parts instead of one joined copy
+                    conn.send(_HTML_HEADER)
+                    conn.send(_HTML_PREFIX)
+                    conn.send(self.generate_html())
+                    conn.send(_HTML_SUFFIX)
             else:
-                response = "HTTP/1.1 404 Not Found\r\n\r\n404 Not Found"
-
-            conn.send(response.encode())
+                conn.send(_NOT_FOUND)
 
         except Exception as e:
             print(f"Error handling request: {e}")
         finally:
             conn.close()
 
+    def tick(self, timeout_ms=0):
+        """Serve pending connections, waiting at most timeout_ms for one
+
+        Call this from the application's main loop; with the default timeout
+        it returns immediately when no client is connecting.
+        """
+        if not self._poller:
+            return
+
+        for sock, event in self._poller.ipoll(timeout_ms):
+            try:
+                conn, addr = self.socket.accept()
+            except OSError:
+                continue
+            # The request follows the connect closely, a short timeout keeps
+            # a slow client from stalling the caller's loop
+            conn.settimeout(0.2)
+            # Send the short responses at once instead of coalescing them,
+            # any failure just leaves Nagle enabled
+            try:
+                conn.setsockopt(socket.IPPROTO_TCP, _TCP_NODELAY, 1)
+            except Exception:
+                pass
+            self.handle_request(conn)
+
     def run_server(self):
         """Run the web server (blocking)"""
         if not self.server_running:
@@ -265,8 +401,7 @@ class WebMonitor:
         print("Web server running... (Ctrl+C to stop)")
         try:
             while True:
-                conn, addr = self.socket.accept()
-                self.handle_request(conn)
+                self.tick(-1)
         except KeyboardInterrupt:
             print("\nWeb server stopped")
         finally:
@@ -274,6 +409,9 @@ class WebMonitor:
 
     def stop_server(self):
         """Stop the web server"""
+        if self._poller:
+            self._poller.unregister(self.socket)
+            self._poller = None
         if self.socket:
             self.socket.close()
             self.socket = None
@@ -287,5 +425,5 @@ if config.WEB_MONITOR_ENABLED:
     web_monitor = WebMonitor(app, ssid="YourWiFi", password="YourPassword")
     if web_monitor.connect_wifi():
         web_monitor.start_server()
-        # Run server in background or separate thread
+        # Then call web_monitor.tick() once per main loop iteration
 """